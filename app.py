@@ -1,47 +1,170 @@
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from fastapi import FastAPI, Request
 from fastapi.responses import Response, RedirectResponse
 from pydantic import BaseModel
 import uvicorn
 import sys
+import os
+import asyncio
 
-from hate.pipeline.train_pipeline import TrainPipeline
 from hate.pipeline.prediction_pipeline import PredictionPipeline
+from hate.pipeline.model_holder import model_holder
+from hate.pipeline.batch_scheduler import MicroBatchScheduler
+from hate.pipeline.stream_scoring import StreamScorer, RequestStreamingResponse
+from hate.pipeline.executors import InferenceExecutor
+from hate.pipeline.training_jobs import TrainingJobManager
+from hate.entity.config_entity import PredictionServingConfig
 from hate.exception import CustomException
 from hate.constants import *
 
+serving_config = PredictionServingConfig()
+
+# Blocking inference runs here, never on the event loop
+inference_executor = InferenceExecutor(
+    max_workers=serving_config.INFERENCE_WORKERS,
+    max_pending=serving_config.INFERENCE_MAX_PENDING
+)
+
+# Training runs queue up here and execute one at a time in a separate process;
+# a succeeded job's own pushed model is swapped in
+training_jobs = TrainingJobManager(
+    on_success=lambda job: model_holder.load(os.path.join(job.artifacts_dir, "pushed_model"))
+)
+
+# Groups concurrent /predict calls into a single forward pass
+scheduler = MicroBatchScheduler(
+    predict_fn=lambda texts: model_holder.get_pipeline().predict_scores(texts),
+    max_batch_size=serving_config.MAX_BATCH_SIZE,
+    max_wait_ms=serving_config.MAX_WAIT_MS,
+    inference_executor=inference_executor
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model and tokenizer once per process, shared by all requests
+    try:
+        await inference_executor.run(model_holder.load)
+    except Exception as e:
+        print(f"⚠️ Model not loaded at startup: {e}")
+    await scheduler.start()
+    training_jobs.start()
+    # Every worker picks up newly pushed models, whichever worker ran the training job
+    model_watcher = asyncio.create_task(model_holder.watch(serving_config.MODEL_RELOAD_INTERVAL_S))
+    yield
+    model_watcher.cancel()
+    training_jobs.stop()
+    await scheduler.stop()
+    inference_executor.shutdown()
+
+
 app = FastAPI(
     title="Hate Speech Detection API",
     description="API to train model and make predictions on text for hate speech detection",
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan
 )
 
 class TextInput(BaseModel):
     text: str
 
+class BatchTextInput(BaseModel):
+    texts: List[str]
+    ids: Optional[List[str]] = None
+
 @app.get("/", tags=["Root"])
 async def index():
     return RedirectResponse(url="/docs")
 
-@app.get("/train", tags=["Training"])
+@app.get("/health", tags=["Root"])
+async def health():
+    return model_holder.status()
+
+@app.get("/metrics", tags=["Root"])
+async def metrics():
+    return {
+        "scheduler": scheduler.metrics.as_dict(),
+        "inference_executor": {
+            "workers": inference_executor.max_workers,
+            "max_pending": inference_executor.max_pending,
+            "pending": inference_executor.pending,
+        },
+    }
+
+@app.post("/train", tags=["Training"], status_code=202)
 async def training():
     try:
-        train_pipeline = TrainPipeline()
-        train_pipeline.run_pipeline()
-        return Response(content="✅ Training completed successfully!", media_type="text/plain")
-    except Exception as e:
-        print(f"❌ Training error: {e}")
-        return Response(content=f"❌ Error during training: {e}", media_type="text/plain")
+        job = training_jobs.submit()
+        return {"job_id": job.job_id, "status": job.status}
+    except RuntimeError as e:
+        return Response(content=f"❌ {e}", media_type="text/plain", status_code=429)
+
+@app.get("/train", tags=["Training"])
+async def training_jobs_list():
+    return {"jobs": training_jobs.list()}
+
+@app.get("/train/{job_id}", tags=["Training"])
+async def training_status(job_id: str):
+    job = training_jobs.get(job_id)
+    if job is None:
+        return Response(content=f"❌ Unknown training job: {job_id}", media_type="text/plain", status_code=404)
+    return job
 
 @app.post("/predict", tags=["Prediction"])
 async def predict_route(input: TextInput):
+    if not model_holder.is_ready:
+        return Response(content="❌ Model is not loaded yet", media_type="text/plain", status_code=503)
     try:
-        text = input.text
-        prediction_pipeline = PredictionPipeline()
-        prediction = prediction_pipeline.run_pipeline(text)
-        return {"prediction": prediction}
+        score = await scheduler.submit(input.text)
+        prediction = PredictionPipeline.label_for(score)
+        return {"prediction": prediction, "model_version": model_holder.artifact_version}
     except Exception as e:
         print(f"❌ Prediction error: {e}")  # 👈 LOG ERROR
         return Response(content=f"❌ Internal server error: {e}", media_type="text/plain")
 
+@app.post("/predict/batch", tags=["Prediction"])
+async def predict_batch_route(input: BatchTextInput):
+    if not model_holder.is_ready:
+        return Response(content="❌ Model is not loaded yet", media_type="text/plain", status_code=503)
+    if len(input.texts) > serving_config.BATCH_MAX_ITEMS:
+        return Response(content=f"❌ Too many texts: {len(input.texts)} > {serving_config.BATCH_MAX_ITEMS}",
+                        media_type="text/plain", status_code=413)
+    if input.ids is not None and len(input.ids) != len(input.texts):
+        return Response(content="❌ 'ids' must have the same length as 'texts'",
+                        media_type="text/plain", status_code=422)
+    try:
+        prediction_pipeline = model_holder.get_pipeline()
+        scores = await inference_executor.run(
+            prediction_pipeline.predict_scores, input.texts, serving_config.BATCH_INFERENCE_SIZE
+        )
+        ids = input.ids if input.ids is not None else list(range(len(input.texts)))
+        results = [
+            {"id": row_id, "score": score, "prediction": PredictionPipeline.label_for(score)}
+            for row_id, score in zip(ids, scores)
+        ]
+        return {"results": results, "model_version": model_holder.artifact_version}
+    except Exception as e:
+        print(f"❌ Batch prediction error: {e}")
+        return Response(content=f"❌ Internal server error: {e}", media_type="text/plain", status_code=500)
+
+@app.post("/predict/stream", tags=["Prediction"])
+async def predict_stream_route(request: Request, offset: int = 0):
+    """
+    Scores a chunked NDJSON body (one JSON string or {"id", "text"} object per line)
+    and streams NDJSON results back as each internal chunk finishes. Pass offset to
+    resume an interrupted upload from that input row.
+    """
+    if not model_holder.is_ready:
+        return Response(content="❌ Model is not loaded yet", media_type="text/plain", status_code=503)
+    if offset < 0:
+        return Response(content="❌ offset must be >= 0", media_type="text/plain", status_code=422)
+    scorer = StreamScorer(
+        prediction_pipeline=model_holder.get_pipeline(),
+        chunk_size=serving_config.STREAM_CHUNK_SIZE,
+        inference_batch_size=serving_config.BATCH_INFERENCE_SIZE,
+        inference_executor=inference_executor
+    )
+    return RequestStreamingResponse(scorer.stream(request.stream(), offset=offset), media_type="application/x-ndjson")
+
 if __name__ == "__main__":
     uvicorn.run("app:app", host="127.0.0.1", port=8000, reload=True)
@@ -0,0 +1,38 @@
+# bench_artifact_formats.py - Write/read time and disk size of intermediate datasets per format
+#
+# Usage: python benchmarks/bench_artifact_formats.py <transformed_csv> [repeats]
+
+import os
+import sys
+import time
+import tempfile
+
+from hate.constants import TWEET, LABEL
+from hate.utils.data_io import DATA_FORMAT_EXTENSIONS, read_table, write_table
+
+DTYPES = {TWEET: str, LABEL: "int8"}
+
+
+def best_of(repeats, fn):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    source_path = sys.argv[1]
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    df = read_table(source_path)
+    print(f"rows: {len(df)}")
+    print(f"{'format':<10}{'write s':>10}{'read s':>10}{'size MB':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for data_format, extension in DATA_FORMAT_EXTENSIONS.items():
+            path = os.path.join(tmp_dir, f"final{extension}")
+            write_seconds = best_of(repeats, lambda: write_table(df, path, DTYPES))
+            read_seconds = best_of(repeats, lambda: read_table(path))
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{data_format:<10}{write_seconds:>10.3f}{read_seconds:>10.3f}{size_mb:>10.2f}")
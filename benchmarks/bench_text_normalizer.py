@@ -0,0 +1,55 @@
+# bench_text_normalizer.py - Rows/sec of the old per-row tweet cleaning vs the shared TextNormalizer
+#
+# Usage: python benchmarks/bench_text_normalizer.py [csv_path] [column] [max_rows]
+
+import re
+import sys
+import time
+import string
+import pandas as pd
+import nltk
+
+from hate.preprocessing.text_normalizer import TextNormalizer, load_stopwords
+
+
+def legacy_clean(text):
+    # Previous DataTransformation.concat_data_cleaning: builds the stemmer and
+    # stopword set per row and runs six separate re.sub passes
+    stemmer = nltk.SnowballStemmer("english")
+    stopword_set = load_stopwords()
+
+    text = str(text).lower()
+    text = re.sub(r'\[.*?\]', '', text)
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'<.*?>+', '', text)
+    text = re.sub(r'[%s]' % re.escape(string.punctuation), '', text)
+    text = re.sub(r'\n', '', text)
+    text = re.sub(r'\w*\d\w*', '', text)
+
+    words = [word for word in text.split() if word not in stopword_set]
+    return " ".join(stemmer.stem(word) for word in words)
+
+
+def rows_per_second(fn, texts):
+    start = time.perf_counter()
+    result = fn(texts)
+    return len(texts) / (time.perf_counter() - start), result
+
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "data/raw_data.csv"
+    column = sys.argv[2] if len(sys.argv) > 2 else "tweet"
+    max_rows = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    texts = pd.read_csv(csv_path, nrows=max_rows)[column].tolist()
+    normalizer = TextNormalizer()
+
+    legacy_rate, legacy_out = rows_per_second(lambda rows: [legacy_clean(t) for t in rows], texts)
+    shared_rate, shared_out = rows_per_second(normalizer.normalize_batch, texts)
+    changed = sum(1 for a, b in zip(legacy_out, shared_out) if a != b)
+
+    print(f"rows:              {len(texts)}")
+    print(f"legacy rows/sec:   {legacy_rate:,.0f}")
+    print(f"shared rows/sec:   {shared_rate:,.0f}")
+    print(f"speedup:           {shared_rate / legacy_rate:.1f}x")
+    print(f"rows that differ:  {changed}")
@@ -6,6 +6,7 @@ from hate.logger import logging
 from hate.exception import CustomException
 from hate.entity.config_entity import DataIngestionConfig
 from hate.entity.artifact_entity import DataIngestionArtifacts
+from hate.utils.data_io import zip_member_path
 
 class DataIngestion:
     def __init__(self, data_ingestion_config: DataIngestionConfig):
@@ -57,11 +58,39 @@ class DataIngestion:
         except Exception as e:
             raise CustomException(e, sys) from e
 
+    def reference_zip_members(self):
+        """
+        Points the artifacts at the CSVs inside the ZIP, so they are read once, sequentially, by
+        data transformation instead of being extracted and copied first.
+        """
+        try:
+            logging.info("📎 Entered reference_zip_members method of DataIngestion class")
+            zip_path = self.data_ingestion_config.ZIP_FILE_PATH
+            raw_member = os.path.basename(self.data_ingestion_config.RAW_DATA_FILE_PATH)
+            imbalance_member = os.path.basename(self.data_ingestion_config.IMBALANCED_DATA_FILE_PATH)
+
+            with ZipFile(zip_path, 'r') as zip_ref:
+                members = set(zip_ref.namelist())
+            for member in (raw_member, imbalance_member):
+                if member not in members:
+                    raise FileNotFoundError(f"❌ {member} not found in {zip_path}")
+
+            logging.info(f"✅ Referencing {raw_member} and {imbalance_member} inside {zip_path}")
+            return zip_member_path(zip_path, imbalance_member), zip_member_path(zip_path, raw_member)
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def initiate_data_ingestion(self) -> DataIngestionArtifacts:
         try:
             logging.info("🚀 Entered initiate_data_ingestion method of DataIngestion class")
             self.get_data_locally()
-            imbalance_data_file_path, raw_data_file_path = self.unzip_and_clean()
+            if self.data_ingestion_config.MODE == "zip_reference":
+                imbalance_data_file_path, raw_data_file_path = self.reference_zip_members()
+            elif self.data_ingestion_config.MODE == "extract":
+                imbalance_data_file_path, raw_data_file_path = self.unzip_and_clean()
+            else:
+                raise ValueError(f"Unknown data ingestion mode: {self.data_ingestion_config.MODE}")
 
             data_ingestion_artifacts = DataIngestionArtifacts(
                 imbalance_data_file_path=imbalance_data_file_path,
@@ -1,30 +1,33 @@
 import os
-import re
 import sys
-import string
 import pandas as pd
-import nltk
-from nltk.corpus import stopwords
+from contextlib import nullcontext
 
 from hate.logger import logging
 from hate.exception import CustomException
 from hate.entity.config_entity import DataTransformationConfig
 from hate.entity.artifact_entity import DataIngestionArtifacts, DataTransformationArtifacts
-
-# Download NLTK stopwords if not already available
-nltk.download('stopwords')
+from hate.preprocessing.text_normalizer import get_normalizer, normalize_parallel, normalizer_pool
+from hate.preprocessing.dedup import factorize_texts, broadcast, duplicate_ratio
+from hate.utils.data_io import read_csv, iter_csv_chunks, write_table, TableWriter
 
 
 class DataTransformation:
     def __init__(self, data_transformation_config: DataTransformationConfig,
-                 data_ingestion_artifacts: DataIngestionArtifacts):
+                 data_ingestion_artifacts: DataIngestionArtifacts, seed_stem_table_path: str = None):
+        """
+        :param seed_stem_table_path: Stem table of a previous run, loaded before cleaning so only
+                                     words it does not cover are stemmed
+        """
         self.data_transformation_config = data_transformation_config
         self.data_ingestion_artifacts = data_ingestion_artifacts
+        self.seed_stem_table_path = seed_stem_table_path
 
-    def imbalance_data_cleaning(self):
+    def imbalance_data_cleaning(self, df: pd.DataFrame = None):
         try:
-            logging.info("Cleaning imbalance data")
-            df = pd.read_csv(self.data_ingestion_artifacts.imbalance_data_file_path)
+            if df is None:
+                logging.info("Cleaning imbalance data")
+                df = read_csv(self.data_ingestion_artifacts.imbalance_data_file_path)
             df.drop(
                 self.data_transformation_config.ID,
                 axis=self.data_transformation_config.AXIS,
@@ -34,10 +37,11 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
-    def raw_data_cleaning(self):
+    def raw_data_cleaning(self, df: pd.DataFrame = None):
         try:
-            logging.info("Cleaning raw data")
-            df = pd.read_csv(self.data_ingestion_artifacts.raw_data_file_path)
+            if df is None:
+                logging.info("Cleaning raw data")
+                df = read_csv(self.data_ingestion_artifacts.raw_data_file_path)
 
             # Drop irrelevant columns
             df.drop(
@@ -68,39 +72,121 @@ class DataTransformation:
 
     def concat_data_cleaning(self, text):
         try:
-            stemmer = nltk.SnowballStemmer("english")
-            stopword_set = set(stopwords.words('english'))
-
-            text = str(text).lower()
-            text = re.sub(r'\[.*?\]', '', text)
-            text = re.sub(r'https?://\S+|www\.\S+', '', text)
-            text = re.sub(r'<.*?>+', '', text)
-            text = re.sub(r'[%s]' % re.escape(string.punctuation), '', text)
-            text = re.sub(r'\n', '', text)
-            text = re.sub(r'\w*\d\w*', '', text)
-
-            words = [word for word in text.split() if word not in stopword_set]
-            stemmed = [stemmer.stem(word) for word in words]
-            return " ".join(stemmed)
+            return get_normalizer().normalize(text)
         except Exception as e:
             raise CustomException(e, sys)
 
-    def initiate_data_transformation(self) -> DataTransformationArtifacts:
+    def clean_tweets(self, tweets, pool=None):
+        """
+        Cleans each distinct tweet once and broadcasts the result to its duplicates.
+
+        :return: Tuple of (cleaned tweets in row order, number of distinct tweets)
+        """
+        try:
+            codes, unique_tweets = factorize_texts(tweets)
+            cleaned = normalize_parallel(
+                unique_tweets,
+                workers=self.data_transformation_config.WORKERS,
+                chunk_size=self.data_transformation_config.CHUNK_SIZE,
+                pool=pool
+            )
+            return broadcast(cleaned, codes), len(unique_tweets)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform_in_memory(self):
+        """
+        :return: Tuple of (rows written, distinct tweets cleaned)
+        """
         try:
-            logging.info("Starting full transformation pipeline")
             df = self.concat_dataframe()
 
             # Clean the tweet text
-            df[self.data_transformation_config.TWEET] = df[self.data_transformation_config.TWEET].apply(
-                self.concat_data_cleaning)
+            df[self.data_transformation_config.TWEET], unique_rows = self.clean_tweets(
+                df[self.data_transformation_config.TWEET])
 
             # Save final cleaned dataset
+            write_table(df, self.data_transformation_config.TRANSFORMED_FILE_PATH, self.data_transformation_config.DTYPES)
+            return len(df), unique_rows
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform_streaming(self):
+        """
+        Same output as transform_in_memory, but reads, cleans and appends one chunk at a time,
+        so peak memory depends on the chunk size rather than the dataset size.
+        Duplicates are only detected within a chunk.
+
+        :return: Tuple of (rows written, distinct tweets cleaned)
+        """
+        try:
+            config = self.data_transformation_config
+            workers = config.WORKERS
+            # One read chunk feeds every worker a CHUNK_SIZE slice
+            rows_per_read = config.CHUNK_SIZE * max(1, workers)
+            sources = [
+                ("raw", self.data_ingestion_artifacts.raw_data_file_path, self.raw_data_cleaning),
+                ("imbalance", self.data_ingestion_artifacts.imbalance_data_file_path, self.imbalance_data_cleaning),
+            ]
+
+            columns = None
+            rows = 0
+            unique_rows = 0
+            chunks = 0
+            next_progress = config.PROGRESS_ROWS
+            with normalizer_pool(workers) if workers > 1 else nullcontext() as pool, \
+                    TableWriter(config.TRANSFORMED_FILE_PATH, config.DTYPES) as writer:
+                for name, path, prepare in sources:
+                    # The cleaning methods only log when they read the whole file themselves
+                    logging.info(f"Cleaning {name} data in chunks of {rows_per_read} rows")
+                    for chunk in iter_csv_chunks(path, chunksize=rows_per_read):
+                        chunk = prepare(chunk)
+                        chunk[config.TWEET], chunk_unique_rows = self.clean_tweets(chunk[config.TWEET], pool=pool)
+                        unique_rows += chunk_unique_rows
+                        # Keep the column order of the first chunk, as pd.concat would
+                        if columns is None:
+                            columns = list(chunk.columns)
+                        writer.write(chunk[columns])
+                        rows += len(chunk)
+                        chunks += 1
+                        if rows >= next_progress:
+                            logging.info(f"Cleaned {rows} rows in {chunks} chunks")
+                            next_progress = rows + config.PROGRESS_ROWS
+            logging.info(f"Streamed {rows} rows in {chunks} chunks into {config.TRANSFORMED_FILE_PATH}")
+            return rows, unique_rows
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def initiate_data_transformation(self) -> DataTransformationArtifacts:
+        try:
+            logging.info(f"Starting full transformation pipeline ({self.data_transformation_config.MODE} mode)")
             os.makedirs(self.data_transformation_config.DATA_TRANSFORMATION_ARTIFACTS_DIR, exist_ok=True)
-            df.to_csv(self.data_transformation_config.TRANSFORMED_FILE_PATH, index=False)
+
+            # Seed before cleaning (and before any pool starts) so known words skip the stemmer
+            if self.seed_stem_table_path is not None:
+                seeded = get_normalizer().load_stem_table(self.seed_stem_table_path)
+                logging.info(f"Seeded {seeded} stems from {self.seed_stem_table_path}")
+
+            if self.data_transformation_config.MODE == "streaming":
+                total_rows, unique_rows = self.transform_streaming()
+            elif self.data_transformation_config.MODE == "in_memory":
+                total_rows, unique_rows = self.transform_in_memory()
+            else:
+                raise ValueError(f"Unknown transformation mode: {self.data_transformation_config.MODE}")
+            logging.info(f"Cleaned {unique_rows} distinct tweets for {total_rows} rows "
+                         f"({duplicate_ratio(total_rows, unique_rows):.1%} duplicates)")
+
+            # Save the memoized stems so serving can look them up
+            stems = get_normalizer().save_stem_table(self.data_transformation_config.STEM_TABLE_FILE_PATH)
+            logging.info(f"Saved {stems} stems to {self.data_transformation_config.STEM_TABLE_FILE_PATH}")
 
             logging.info(f"Transformation complete, saved to {self.data_transformation_config.TRANSFORMED_FILE_PATH}")
             return DataTransformationArtifacts(
-                transformed_data_path=self.data_transformation_config.TRANSFORMED_FILE_PATH
+                transformed_data_path=self.data_transformation_config.TRANSFORMED_FILE_PATH,
+                stem_table_path=self.data_transformation_config.STEM_TABLE_FILE_PATH,
+                total_rows=total_rows,
+                unique_rows=unique_rows,
+                duplicate_ratio=duplicate_ratio(total_rows, unique_rows)
             )
 
         except Exception as e:
@@ -1,12 +1,8 @@
 import os
 import sys
 import keras
-import pickle
-import numpy as np
-import pandas as pd
 from hate.logger import logging
 from hate.exception import CustomException
-from keras.utils import pad_sequences
 from sklearn.metrics import confusion_matrix
 from hate.constants import *
 from hate.entity.config_entity import ModelEvaluationConfig
@@ -15,6 +11,10 @@ from hate.entity.artifact_entity import (
     ModelTrainerArtifacts,
     DataTransformationArtifacts
 )
+from hate.utils.data_io import read_table
+from hate.preprocessing.ragged import RaggedTokens, load_tokens
+from hate.preprocessing.sequences import fit_width
+from hate.ml.ragged_batches import PaddedBatchSequence
 
 
 class ModelEvaluation:
@@ -28,26 +28,24 @@ class ModelEvaluation:
         self.model_trainer_artifacts = model_trainer_artifacts
         self.data_transformation_artifacts = data_transformation_artifacts
 
-    def evaluate_model(self, model, tokenizer, x_test, y_test):
+    def evaluate_model(self, model, tokens, y_test):
+        """
+        :param tokens: Test tokens from load_tokens: a padded matrix, or RaggedTokens padded per batch;
+                       either is fitted to the model's own sequence length, which can differ between runs
+        """
         try:
             logging.info("✅ Evaluating model...")
-
-            # Ensure x_test is a Series of strings
-            if isinstance(x_test, pd.DataFrame):
-                if x_test.shape[1] == 0:
-                    raise ValueError("❌ x_test DataFrame has no columns.")
-                x_test = x_test.iloc[:, 0]  # Take first column if it's a DataFrame
-
-            x_test = x_test.fillna("").astype(str)
             y_test = y_test.squeeze()
 
-            # Tokenize and pad test text
-            sequences = tokenizer.texts_to_sequences(x_test)
-            padded = pad_sequences(sequences, maxlen=MAX_LEN)
-
             # Evaluate model
-            loss, accuracy = model.evaluate(padded, y_test, verbose=0)
-            predictions = model.predict(padded)
+            if isinstance(tokens, RaggedTokens):
+                batches = PaddedBatchSequence(tokens, model.input_shape[1], y_test.to_numpy())
+                loss, accuracy = model.evaluate(batches, verbose=0)
+                predictions = model.predict(batches)
+            else:
+                tokens = fit_width(tokens, model.input_shape[1])
+                loss, accuracy = model.evaluate(tokens, y_test, verbose=0)
+                predictions = model.predict(tokens)
             pred_labels = [1 if p[0] >= 0.5 else 0 for p in predictions]
 
             # Log confusion matrix
@@ -62,16 +60,14 @@ class ModelEvaluation:
         try:
             logging.info("🚀 Starting model evaluation...")
 
-            # Load trained model and tokenizer
+            # Load trained model
             trained_model = keras.models.load_model(self.model_trainer_artifacts.trained_model_path)
-            with open('tokenizer.pickle', 'rb') as handle:
-                tokenizer = pickle.load(handle)
 
-            # Load test datasets
-            x_test = pd.read_csv(self.model_trainer_artifacts.x_test_path)
-            y_test = pd.read_csv(self.model_trainer_artifacts.y_test_path)
+            # Load the test split, already tokenized by the trainer
+            tokens = load_tokens(self.model_trainer_artifacts.x_test_sequences_path)
+            y_test = read_table(self.model_trainer_artifacts.y_test_path)
 
-            trained_model_accuracy = self.evaluate_model(trained_model, tokenizer, x_test, y_test)
+            trained_model_accuracy = self.evaluate_model(trained_model, tokens, y_test)
 
             best_model_path = os.path.join(
                 self.model_evaluation_config.BEST_MODEL_DIR_PATH,
@@ -85,7 +81,7 @@ class ModelEvaluation:
             else:
                 logging.info("🔁 Comparing with best model...")
                 best_model = keras.models.load_model(best_model_path)
-                best_model_accuracy = self.evaluate_model(best_model, tokenizer, x_test, y_test)
+                best_model_accuracy = self.evaluate_model(best_model, tokens, y_test)
                 is_model_accepted = trained_model_accuracy > best_model_accuracy
                 logging.info(f"✅ Model accepted: {is_model_accepted}")
 
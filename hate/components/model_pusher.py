@@ -1,10 +1,19 @@
 import os
 import sys
+import json
+import pickle
 import shutil
 from hate.logger import logging
 from hate.exception import CustomException
 from hate.entity.config_entity import ModelPusherConfig
 from hate.entity.artifact_entity import ModelPusherArtifacts, ModelTrainerArtifacts
+from hate.ml.numpy_lstm import LSTMWeights, NumpyLSTMModel
+from hate.ml.quantization import save_quantized, load_quantized, quantization_report, quantize_weights
+from hate.ml.weight_store import save_weight_store
+from hate.preprocessing.vocabulary import CompactTokenizer
+from hate.utils.data_io import read_table
+from hate.preprocessing.ragged import RaggedTokens, load_tokens
+from hate.pipeline.prediction_pipeline import publish_pushed_model
 
 
 class ModelPusher:
@@ -13,37 +22,149 @@ class ModelPusher:
         self.model_trainer_artifacts = model_trainer_artifacts
         self.model_pusher_config = model_pusher_config
 
+    def quantize_model(self, weights: LSTMWeights):
+        """
+        Writes the int8 weight bundle and reports its accuracy delta against the float model on the test split.
+        """
+        try:
+            quantized_model_path = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.QUANTIZED_MODEL_NAME
+            )
+            save_quantized(weights, quantized_model_path)
+            logging.info(f"✅ Int8 model pushed to: {quantized_model_path}")
+
+            padded = load_tokens(self.model_trainer_artifacts.x_test_sequences_path)
+            if isinstance(padded, RaggedTokens):
+                padded = padded.pad(weights.maxlen)
+            y_test = read_table(self.model_trainer_artifacts.y_test_path).iloc[:, 0]
+
+            report = quantization_report(
+                NumpyLSTMModel(weights),
+                NumpyLSTMModel(load_quantized(quantized_model_path)),
+                padded,
+                y_test.to_numpy()
+            )
+            report_path = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.QUANTIZATION_REPORT_NAME
+            )
+            with open(report_path, 'w') as handle:
+                json.dump(report, handle, indent=2)
+            logging.info(f"📊 Int8 quantization report: {report}")
+            return quantized_model_path, report
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def initiate_model_pusher(self) -> ModelPusherArtifacts:
         try:
             logging.info("🚀 Starting model pusher...")
 
             os.makedirs(self.model_pusher_config.PUSHED_MODEL_DIR, exist_ok=True)
 
-            # ✅ Push the trained model
-            pushed_model_path = os.path.join(
-                self.model_pusher_config.PUSHED_MODEL_DIR,
-                self.model_pusher_config.MODEL_NAME
-            )
-            shutil.copy(
-                src=self.model_trainer_artifacts.trained_model_path,
-                dst=pushed_model_path
-            )
-            logging.info(f"✅ Model pushed to: {pushed_model_path}")
+            # model.h5 marks a pushed model as ready, so it is moved into place only after every
+            # other serving artifact has been written and checked
+            weights = LSTMWeights.from_h5(self.model_trainer_artifacts.trained_model_path)
+            if weights.maxlen != self.model_trainer_artifacts.max_len:
+                raise ValueError(
+                    f"Model input length {weights.maxlen} != trainer max_len {self.model_trainer_artifacts.max_len}"
+                )
 
             # ✅ Push the tokenizer
             pushed_tokenizer_path = os.path.join(
                 self.model_pusher_config.PUSHED_MODEL_DIR,
-                "tokenizer.pickle"
+                self.model_pusher_config.TOKENIZER_FILE_NAME
             )
             shutil.copy(
-                src="tokenizer.pickle",  # assuming it's saved in root after training
+                src=self.model_trainer_artifacts.tokenizer_path,
                 dst=pushed_tokenizer_path
             )
             logging.info(f"✅ Tokenizer pushed to: {pushed_tokenizer_path}")
 
+            # ✅ Push the stem table so serving looks stems up instead of recomputing them
+            pushed_stem_table_path = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.STEM_TABLE_FILE_NAME
+            )
+            shutil.copy(
+                src=self.model_trainer_artifacts.stem_table_path,
+                dst=pushed_stem_table_path
+            )
+            logging.info(f"✅ Stem table pushed to: {pushed_stem_table_path}")
+
+            # ✅ Compact, pickle-free vocabulary for serving
+            pushed_vocabulary_path = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.VOCABULARY_FILE_NAME
+            )
+            with open(pushed_tokenizer_path, 'rb') as handle:
+                CompactTokenizer.from_keras_tokenizer(pickle.load(handle)).save(pushed_vocabulary_path)
+            logging.info(f"✅ Vocabulary pushed to: {pushed_vocabulary_path}")
+
+            # ✅ Compile the serving model (embedding folded into the LSTM input projection)
+            compiled_model_path = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.COMPILED_MODEL_NAME
+            )
+            weights.save_compiled(compiled_model_path)
+            logging.info(f"✅ Compiled model pushed to: {compiled_model_path}")
+
+            # ✅ Int8 weight bundle for memory-constrained serving
+            quantized_model_path, report = self.quantize_model(weights)
+
+            # ✅ Memory-mappable weight store shared by all serving workers on a host
+            weight_store_dir = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.WEIGHT_STORE_DIR_NAME
+            )
+            save_weight_store(
+                weight_store_dir,
+                arrays={
+                    **weights.float_arrays(),
+                    "gate_table": weights.compiled().gate_table,
+                    **quantize_weights(weights),
+                },
+                metadata=weights.metadata()
+            )
+            logging.info(f"✅ Weight store pushed to: {weight_store_dir}")
+
+            # ✅ Sequence length and vocabulary size serving tokenizes with
+            model_metadata_path = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.MODEL_METADATA_FILE_NAME
+            )
+            with open(model_metadata_path, 'w') as handle:
+                json.dump({
+                    "max_len": self.model_trainer_artifacts.max_len,
+                    "vocab_size": int(weights.embeddings.shape[0]),
+                }, handle, indent=2)
+            logging.info(f"✅ Model metadata pushed to: {model_metadata_path}")
+
+            # ✅ Push the trained model last, atomically
+            pushed_model_path = os.path.join(
+                self.model_pusher_config.PUSHED_MODEL_DIR,
+                self.model_pusher_config.MODEL_NAME
+            )
+            shutil.copy(
+                src=self.model_trainer_artifacts.trained_model_path,
+                dst=pushed_model_path + ".tmp"
+            )
+            os.replace(pushed_model_path + ".tmp", pushed_model_path)
+            logging.info(f"✅ Model pushed to: {pushed_model_path}")
+
+            # ✅ Point every API worker at this model
+            publish_pushed_model(self.model_pusher_config.PUSHED_MODEL_DIR)
+
             return ModelPusherArtifacts(
                 pushed_model_dir=self.model_pusher_config.PUSHED_MODEL_DIR,
-                model_file_path=pushed_model_path
+                model_file_path=pushed_model_path,
+                compiled_model_path=compiled_model_path,
+                quantized_model_path=quantized_model_path,
+                quantization_report=report,
+                weight_store_dir=weight_store_dir,
+                vocabulary_path=pushed_vocabulary_path,
+                stem_table_path=pushed_stem_table_path,
+                model_metadata_path=model_metadata_path
             )
 
         except Exception as e:
@@ -1,7 +1,15 @@
 import os 
 import sys
+import math
 import pickle
-import pandas as pd
+import shutil
+import keras
+import numpy as np
+import hate.ml.vocabulary_pruning as vocabulary_pruning_module
+import hate.preprocessing.dedup as dedup_module
+import hate.preprocessing.sequences as sequences_module
+import hate.preprocessing.ragged as ragged_module
+import hate.utils.data_io as data_io_module
 from hate.logger import logging
 from hate.constants import *
 from hate.exception import CustomException
@@ -11,21 +19,28 @@ from keras.utils import pad_sequences
 from hate.entity.config_entity import ModelTrainerConfig
 from hate.entity.artifact_entity import ModelTrainerArtifacts, DataTransformationArtifacts
 from hate.ml.model import ModelArchitecture
+from hate.ml.vocabulary_pruning import vocabulary_size
+from hate.preprocessing.dedup import factorize_texts, broadcast
+from hate.preprocessing.sequences import token_dtype, percentile_length
+from hate.preprocessing.ragged import RaggedTokens, load_tokens, save_tokens
+from hate.ml.ragged_batches import PaddedBatchSequence
+from hate.pipeline.stage_cache import StageCache
+from hate.utils.data_io import read_table, write_table
 
 
 class ModelTrainer:
     def __init__(self, data_transformation_artifacts: DataTransformationArtifacts,
-                 model_trainer_config: ModelTrainerConfig):
+                 model_trainer_config: ModelTrainerConfig, stage_cache: StageCache = None):
         self.data_transformation_artifacts = data_transformation_artifacts
         self.model_trainer_config = model_trainer_config
+        self.stage_cache = stage_cache if stage_cache is not None else StageCache()
 
     def spliting_data(self, csv_path):
         try:
             logging.info("📥 Reading and splitting data")
-            df = pd.read_csv(csv_path, index_col=False)
-
-            # Ensure text and label are valid
-            x = df[TWEET].fillna("").astype(str)  # ensure all tweets are strings
+            # Tweets come back as strings (empty ones included) in every format
+            df = read_table(csv_path, dtypes=self.model_trainer_config.DTYPES)
+            x = df[TWEET]
             y = df[LABEL]
 
             x_train, x_test, y_train, y_test = train_test_split(
@@ -38,52 +53,200 @@ class ModelTrainer:
         try:
             logging.info("🔤 Tokenizing text data")
 
-            # Ensure all data is string (prevents .lower() on float errors)
-            x_train = x_train.astype(str)
-
             tokenizer = Tokenizer(num_words=self.model_trainer_config.MAX_WORDS)
             tokenizer.fit_on_texts(x_train)
-            sequences = tokenizer.texts_to_sequences(x_train)
-            sequences_matrix = pad_sequences(sequences, maxlen=self.model_trainer_config.MAX_LEN)
-            return sequences_matrix, tokenizer
+
+            # Size the vocabulary from the fitted words instead of always using MAX_WORDS
+            tokenizer.num_words = vocabulary_size(
+                tokenizer,
+                max_words=self.model_trainer_config.MAX_WORDS,
+                min_frequency=self.model_trainer_config.MIN_WORD_FREQUENCY
+            )
+            logging.info(f"🔤 Vocabulary size: {tokenizer.num_words} (of {len(tokenizer.word_index)} words seen)")
+
+            # Word counts above need every row; sequences only need each distinct text once
+            sequences, codes = self.texts_to_sequences(tokenizer, x_train)
+            lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))[codes]
+            max_len = percentile_length(
+                lengths,
+                percentile=self.model_trainer_config.MAX_LEN_PERCENTILE,
+                max_len=self.model_trainer_config.MAX_LEN
+            )
+            logging.info(
+                f"📏 Sequence length: {max_len} ({self.model_trainer_config.MAX_LEN_PERCENTILE:g}th percentile "
+                f"of training lengths, longest {lengths.max(initial=0)}, capped at {self.model_trainer_config.MAX_LEN})"
+            )
+
+            sequences_matrix = self.sequences_to_matrix(sequences, codes, tokenizer.num_words, max_len)
+            return sequences_matrix, tokenizer, max_len
         except Exception as e:
             raise CustomException(e, sys) from e
 
-    def initiate_model_trainer(self) -> ModelTrainerArtifacts:
+    def tokenization_fingerprint(self) -> str:
+        config = self.model_trainer_config
+        return self.stage_cache.fingerprint(
+            TOKENIZATION_STAGE,
+            input_paths=[self.data_transformation_artifacts.transformed_data_path],
+            config={
+                "max_words": config.MAX_WORDS,
+                "min_word_frequency": config.MIN_WORD_FREQUENCY,
+                "max_len": config.MAX_LEN,
+                "max_len_percentile": config.MAX_LEN_PERCENTILE,
+                "data_format": config.DATA_FORMAT,
+                "token_storage": config.TOKEN_STORAGE,
+                "keras": keras.__version__,
+            },
+            # Trainer methods individually, so editing the training loop keeps the token cache;
+            # whole modules for the helpers that shape or read the cached files
+            sources=[
+                ModelTrainer.spliting_data,
+                ModelTrainer.tokenizing,
+                ModelTrainer.texts_to_sequences,
+                ModelTrainer.sequences_to_matrix,
+                ModelTrainer.prepare_training_data,
+                vocabulary_pruning_module,
+                dedup_module,
+                sequences_module,
+                ragged_module,
+                data_io_module,
+            ]
+        )
+
+    def prepare_training_data(self):
+        """
+        Splits and tokenizes the transformed data, or reuses the outputs of a previous run whose
+        data, tokenizer settings and code were the same.
+
+        :return: Tuple of (outputs dict of file paths and max_len, x_train, y_train, sequences_matrix, tokenizer, cache_hit)
+        """
         try:
-            logging.info("🚀 Starting model training process")
+            config = self.model_trainer_config
+            fingerprint = self.tokenization_fingerprint()
+            outputs = self.stage_cache.lookup(TOKENIZATION_STAGE, fingerprint)
+            if outputs is not None:
+                x_train = read_table(outputs["x_train_path"], dtypes=config.DTYPES).iloc[:, 0]
+                y_train = read_table(outputs["y_train_path"]).iloc[:, 0]
+                sequences_matrix = load_tokens(outputs["x_train_sequences_path"])
+                with open(outputs["tokenizer_path"], 'rb') as handle:
+                    tokenizer = pickle.load(handle)
+                return outputs, x_train, y_train, sequences_matrix, tokenizer, True
+
             x_train, x_test, y_train, y_test = self.spliting_data(
                 csv_path=self.data_transformation_artifacts.transformed_data_path
             )
+            sequences_matrix, tokenizer, max_len = self.tokenizing(x_train)
 
-            model_architecture = ModelArchitecture()
-            model = model_architecture.get_model()
+            os.makedirs(config.TRAINED_MODEL_DIR, exist_ok=True)
+            # Save tokenizer next to the model of this run
+            with open(config.TOKENIZER_PATH, 'wb') as handle:
+                pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            save_tokens(sequences_matrix, config.X_TRAIN_SEQUENCES_PATH)
+            save_tokens(
+                self.sequences_to_matrix(*self.texts_to_sequences(tokenizer, x_test), tokenizer.num_words, max_len),
+                config.X_TEST_SEQUENCES_PATH
+            )
+            write_table(x_test, config.X_TEST_DATA_PATH, config.DTYPES)
+            write_table(y_test, config.Y_TEST_DATA_PATH, config.DTYPES)
+            write_table(x_train, config.X_TRAIN_DATA_PATH, config.DTYPES)
+            write_table(y_train, config.Y_TRAIN_DATA_PATH, config.DTYPES)
+
+            outputs = {
+                "tokenizer_path": config.TOKENIZER_PATH,
+                "x_train_path": config.X_TRAIN_DATA_PATH,
+                "y_train_path": config.Y_TRAIN_DATA_PATH,
+                "x_test_path": config.X_TEST_DATA_PATH,
+                "y_test_path": config.Y_TEST_DATA_PATH,
+                "x_train_sequences_path": config.X_TRAIN_SEQUENCES_PATH,
+                "x_test_sequences_path": config.X_TEST_SEQUENCES_PATH,
+                "max_len": max_len,
+            }
+            self.stage_cache.store(TOKENIZATION_STAGE, fingerprint, outputs)
+            return outputs, x_train, y_train, sequences_matrix, tokenizer, False
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def texts_to_sequences(self, tokenizer, texts):
+        """
+        Token sequences of each distinct text, tokenizing every text once.
 
-            sequences_matrix, tokenizer = self.tokenizing(x_train)
+        :return: Tuple of (sequences of the distinct texts, codes mapping each row to its sequence)
+        """
+        try:
+            codes, unique_texts = factorize_texts(texts)
+            return tokenizer.texts_to_sequences(unique_texts), codes
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def sequences_to_matrix(self, sequences, codes, num_words, max_len):
+        """
+        Token matrix of every row, storing indices in the smallest dtype the vocabulary allows.
+        Padded to max_len, or RaggedTokens with ragged TOKEN_STORAGE.
+        """
+        try:
+            if self.model_trainer_config.TOKEN_STORAGE == "ragged":
+                return RaggedTokens.from_sequences(broadcast(sequences, codes), dtype=token_dtype(num_words))
+            return pad_sequences(sequences, maxlen=max_len, dtype=token_dtype(num_words))[codes]
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def fit_model(self, model, sequences_matrix, y_train, max_len):
+        try:
+            config = self.model_trainer_config
+            if not isinstance(sequences_matrix, RaggedTokens):
+                return model.fit(
+                    sequences_matrix, y_train,
+                    batch_size=config.BATCH_SIZE,
+                    epochs=config.EPOCH,
+                    validation_split=config.VALIDATION_SPLIT
+                )
+
+            # Sequences don't support validation_split; hold out the same trailing rows Keras would
+            rows = np.arange(len(sequences_matrix))
+            split_at = int(math.floor(len(rows) * (1.0 - config.VALIDATION_SPLIT)))
+            y_train = np.asarray(y_train)
+            return model.fit(
+                PaddedBatchSequence(sequences_matrix, max_len, y_train, rows[:split_at], config.BATCH_SIZE,
+                                    shuffle=True, seed=config.RANDOM_STATE),
+                validation_data=PaddedBatchSequence(sequences_matrix, max_len, y_train, rows[split_at:],
+                                                    config.BATCH_SIZE),
+                epochs=config.EPOCH
+            )
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def initiate_model_trainer(self) -> ModelTrainerArtifacts:
+        try:
+            logging.info("🚀 Starting model training process")
+            outputs, x_train, y_train, sequences_matrix, tokenizer, cache_hit = self.prepare_training_data()
 
-            model.fit(
-                sequences_matrix, y_train,
-                batch_size=self.model_trainer_config.BATCH_SIZE,
-                epochs=self.model_trainer_config.EPOCH,
-                validation_split=self.model_trainer_config.VALIDATION_SPLIT
+            model_architecture = ModelArchitecture()
+            model = model_architecture.get_model(
+                input_dim=tokenizer.num_words,
+                input_length=outputs["max_len"]
             )
 
-            # Save tokenizer
-            with open('tokenizer.pickle', 'wb') as handle:
-                pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            self.fit_model(model, sequences_matrix, y_train, outputs["max_len"])
 
             os.makedirs(self.model_trainer_config.TRAINED_MODEL_DIR, exist_ok=True)
+            shutil.copy(
+                src=self.data_transformation_artifacts.stem_table_path,
+                dst=self.model_trainer_config.STEM_TABLE_PATH
+            )
 
-            # Save model and datasets
+            # Save model
             model.save(self.model_trainer_config.TRAINED_MODEL_PATH)
-            x_test.to_csv(self.model_trainer_config.X_TEST_DATA_PATH, index=False)
-            y_test.to_csv(self.model_trainer_config.Y_TEST_DATA_PATH, index=False)
-            x_train.to_csv(self.model_trainer_config.X_TRAIN_DATA_PATH, index=False)
 
+            # Tokenizer and test split come from this run, or from the run they were cached from
             model_trainer_artifacts = ModelTrainerArtifacts(
                 trained_model_path=self.model_trainer_config.TRAINED_MODEL_PATH,
-                x_test_path=self.model_trainer_config.X_TEST_DATA_PATH,
-                y_test_path=self.model_trainer_config.Y_TEST_DATA_PATH
+                x_test_path=outputs["x_test_path"],
+                y_test_path=outputs["y_test_path"],
+                tokenizer_path=outputs["tokenizer_path"],
+                stem_table_path=self.model_trainer_config.STEM_TABLE_PATH,
+                x_train_sequences_path=outputs["x_train_sequences_path"],
+                x_test_sequences_path=outputs["x_test_sequences_path"],
+                max_len=outputs["max_len"],
+                tokenization_cache_hit=cache_hit
             )
 
             logging.info("✅ Model training complete. Artifacts created.")
@@ -16,6 +16,7 @@ DATA_INGESTION_ARTIFACTS_DIR = "DataIngestionArtifacts"
 # ✅ Folders (not file names) for organizing raw & imbalanced data
 DATA_INGESTION_IMBALANCE_DATA_DIR = "imbalanced"
 DATA_INGESTION_RAW_DATA_DIR = "raw"
+DATA_INGESTION_MODE = os.getenv("DATA_INGESTION_MODE", "zip_reference")  # zip_reference (read CSVs in place) | extract
 
 # Data transformation constants
 DATA_TRANSFORMATION_ARTIFACTS_DIR = 'DataTransformationArtifacts'
@@ -26,6 +27,13 @@ AXIS = 1
 INPLACE = True
 DROP_COLUMNS = ['Unnamed: 0', 'count', 'hate_speech', 'offensive_language', 'neither']
 CLASS = 'class'
+STEM_TABLE_FILE_NAME = 'stem_table.json'  # word -> stem lookup built while cleaning, shipped with the tokenizer
+STEM_CACHE_SIZE = 200000  # max words memoized by the text normalizer's stem cache
+TRANSFORMATION_WORKERS = int(os.getenv("TRANSFORMATION_WORKERS", 1))  # processes cleaning text; 1 = serial
+TRANSFORMATION_CHUNK_SIZE = int(os.getenv("TRANSFORMATION_CHUNK_SIZE", 5000))  # rows per cleaning chunk
+TRANSFORMATION_MODE = os.getenv("TRANSFORMATION_MODE", "in_memory")  # in_memory | streaming (chunked, bounded memory)
+TRANSFORMATION_PROGRESS_ROWS = int(os.getenv("TRANSFORMATION_PROGRESS_ROWS", 100000))  # rows between streaming progress logs
+INTERMEDIATE_DATA_FORMAT = os.getenv("INTERMEDIATE_DATA_FORMAT", "csv")  # csv | parquet | feather (columnar needs pyarrow)
 
 # Model training constants
 MODEL_TRAINER_ARTIFACTS_DIR = 'ModelTrainerArtifacts'
@@ -34,6 +42,13 @@ TRAINED_MODEL_NAME = 'model.h5'
 X_TEST_FILE_NAME = 'x_test.csv'
 Y_TEST_FILE_NAME = 'y_test.csv'
 X_TRAIN_FILE_NAME = 'x_train.csv'
+Y_TRAIN_FILE_NAME = 'y_train.csv'
+X_TRAIN_SEQUENCES_FILE_NAME = 'x_train_sequences.npy'  # padded token matrices (uint16 when the vocabulary fits),
+X_TEST_SEQUENCES_FILE_NAME = 'x_test_sequences.npy'  # memory-mapped by retraining, evaluation and the pusher
+X_TRAIN_TOKENS_DIR_NAME = 'x_train_tokens'  # ragged (tokens.npy + offsets.npy) alternative to the padded matrices
+X_TEST_TOKENS_DIR_NAME = 'x_test_tokens'
+TOKEN_STORAGE = os.getenv("TOKEN_STORAGE", "dense")  # dense (padded .npy) | ragged (padded per batch on demand)
+TOKENIZER_FILE_NAME = 'tokenizer.pickle'
 
 RANDOM_STATE = 42
 EPOCH = 1
@@ -41,8 +56,10 @@ BATCH_SIZE = 128
 VALIDATION_SPLIT = 0.2
 
 # Model architecture constants
-MAX_WORDS = 50000
-MAX_LEN = 300
+MAX_WORDS = 50000  # upper bound; the embedding is sized from the fitted vocabulary
+MIN_WORD_FREQUENCY = 1  # words seen fewer times than this are dropped from the vocabulary
+MAX_LEN = 300  # upper bound; the trainer pads to MAX_LEN_PERCENTILE of the training token lengths
+MAX_LEN_PERCENTILE = float(os.getenv("MAX_LEN_PERCENTILE", "99"))  # 100 fits the longest training text
 LOSS = 'binary_crossentropy'
 METRICS = ['accuracy']
 ACTIVATION = 'sigmoid'
@@ -53,6 +70,49 @@ BEST_MODEL_DIR = "best_Model"
 MODEL_EVALUATION_FILE_NAME = 'loss.csv'
 MODEL_NAME = 'model.h5'
 
+# Model pusher constants
+COMPILED_MODEL_NAME = 'compiled_model.npz'  # embedding folded into the LSTM input projection
+QUANTIZED_MODEL_NAME = 'model_int8.npz'  # int8 embedding and LSTM weights
+QUANTIZATION_REPORT_NAME = 'quantization_report.json'  # float vs int8 accuracy on the test split
+WEIGHT_STORE_DIR_NAME = 'weights'  # .npy files + header.json, memory-mapped by serving workers
+VOCABULARY_FILE_NAME = 'vocab.npz'  # compact word -> index table replacing tokenizer.pickle at serving
+MODEL_METADATA_FILE_NAME = 'model_metadata.json'  # sequence length and vocabulary size serving pads with
+
+# Prediction serving constants (overridable through environment variables)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "keras")  # "keras", "numpy", "numpy_compiled" or "numpy_int8"
+PREDICT_MAX_BATCH_SIZE = int(os.getenv("PREDICT_MAX_BATCH_SIZE", 64))  # rows per micro-batch
+PREDICT_MAX_WAIT_MS = float(os.getenv("PREDICT_MAX_WAIT_MS", 5))  # how long a batch waits to fill up
+BATCH_PREDICT_MAX_ITEMS = int(os.getenv("BATCH_PREDICT_MAX_ITEMS", 10000))  # texts per /predict/batch call
+BATCH_PREDICT_INFERENCE_SIZE = int(os.getenv("BATCH_PREDICT_INFERENCE_SIZE", 512))  # rows per model.predict batch
+STREAM_PREDICT_CHUNK_SIZE = int(os.getenv("STREAM_PREDICT_CHUNK_SIZE", 2048))  # rows held per streamed chunk
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 2))  # threads running blocking inference
+INFERENCE_MAX_PENDING = int(os.getenv("INFERENCE_MAX_PENDING", 16))  # inference calls admitted at once
+MODEL_RELOAD_INTERVAL_S = float(os.getenv("MODEL_RELOAD_INTERVAL_S", 5))  # how often each API worker looks for a newer pushed model
+
+# Training job constants
+DATA_INGESTION_STAGE = "data_ingestion"
+DATA_TRANSFORMATION_STAGE = "data_transformation"
+MODEL_TRAINER_STAGE = "model_trainer"
+MODEL_EVALUATION_STAGE = "model_evaluation"
+MODEL_PUSHER_STAGE = "model_pusher"
+TRAINING_STAGES = [
+    DATA_INGESTION_STAGE,
+    DATA_TRANSFORMATION_STAGE,
+    MODEL_TRAINER_STAGE,
+    MODEL_EVALUATION_STAGE,
+    MODEL_PUSHER_STAGE,
+]
+TRAINING_NICENESS = 10  # scheduling priority penalty for the training process
+TRAINING_MAX_QUEUED_JOBS = 4
+TRAINING_LOCK_FILE = os.path.join("artifacts", ".training.lock")  # held by the running training process
+TRAINING_JOBS_DIR = os.path.join("artifacts", "training_jobs")  # one <job_id>.json record per job, read by every API worker
+LATEST_MODEL_FILE_NAME = 'latest_model.json'  # under artifacts/, points every API worker at the newest pushed model
+
+# Stage cache constants
+STAGE_CACHE_DIR = os.path.join("artifacts", ".stage_cache")  # fingerprint -> outputs index of previous runs
+STAGE_CACHE_ENABLED = os.getenv("STAGE_CACHE_ENABLED", "true").lower() == "true"
+TOKENIZATION_STAGE = "tokenization"  # cached separately from model training
+
 # FastAPI app settings
 APP_HOST = "0.0.0.0"
 APP_PORT = 8080
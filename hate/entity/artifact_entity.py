@@ -3,13 +3,20 @@ from dataclasses import dataclass
 # ✅ Data ingestion artifact
 @dataclass
 class DataIngestionArtifacts:
+    # Plain CSV paths, or "<zip>::<member>" references read through hate.utils.data_io
     raw_data_file_path: str
     imbalance_data_file_path: str
+    cache_hit: bool = False  # reused from a previous run with the same fingerprint
 
 # ✅ Data transformation artifact
 @dataclass
 class DataTransformationArtifacts:
     transformed_data_path: str
+    stem_table_path: str
+    total_rows: int
+    unique_rows: int  # distinct tweets actually cleaned
+    duplicate_ratio: float
+    cache_hit: bool = False
 
 # ✅ Model trainer artifact
 @dataclass
@@ -17,6 +24,12 @@ class ModelTrainerArtifacts:
     trained_model_path: str
     x_test_path: str
     y_test_path: str
+    tokenizer_path: str
+    stem_table_path: str
+    x_train_sequences_path: str  # padded .npy matrix or ragged directory, load with load_tokens
+    x_test_sequences_path: str
+    max_len: int  # sequence length the model was built with, chosen from the training token lengths
+    tokenization_cache_hit: bool = False  # split, tokenizer and padded matrix reused from a previous run
 
 # ✅ Model evaluation artifact
 @dataclass
@@ -28,3 +41,10 @@ class ModelEvaluationArtifacts:
 class ModelPusherArtifacts:
     pushed_model_dir: str
     model_file_path: str
+    compiled_model_path: str
+    quantized_model_path: str
+    quantization_report: dict
+    weight_store_dir: str
+    vocabulary_path: str
+    stem_table_path: str
+    model_metadata_path: str
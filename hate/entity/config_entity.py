@@ -1,17 +1,18 @@
 from dataclasses import dataclass
 import os
 from hate.constants import *
+from hate.utils.data_io import data_file_name
 
 @dataclass
 class DataIngestionConfig:
-    def __init__(self):
+    def __init__(self, artifacts_dir: str = ARTIFACTS_DIR):
         # ZIP file path and its containing directory
         self.ZIP_FILE_PATH: str = os.path.join(os.getcwd(), "data", ZIP_FILE_NAME)
         self.ZIP_FILE_DIR: str = os.path.dirname(self.ZIP_FILE_PATH)
 
         # Base directory for all data ingestion artifacts
         self.DATA_INGESTION_ARTIFACTS_DIR: str = os.path.join(
-            os.getcwd(), ARTIFACTS_DIR, DATA_INGESTION_ARTIFACTS_DIR
+            os.getcwd(), artifacts_dir, DATA_INGESTION_ARTIFACTS_DIR
         )
 
         # Organized subdirectories for raw and imbalanced data
@@ -22,15 +23,22 @@ class DataIngestionConfig:
         self.RAW_DATA_FILE_PATH: str = os.path.join(self.RAW_DATA_DIR, "raw_data.csv")
         self.IMBALANCED_DATA_FILE_PATH: str = os.path.join(self.IMBALANCED_DATA_DIR, "imbalanced_data.csv")
 
+        # zip_reference points downstream readers at the archive members instead of copying them
+        self.MODE = DATA_INGESTION_MODE
+
 
 @dataclass
 class DataTransformationConfig:
-    def __init__(self):
+    def __init__(self, artifacts_dir: str = ARTIFACTS_DIR):
         self.DATA_TRANSFORMATION_ARTIFACTS_DIR: str = os.path.join(
-            os.getcwd(), ARTIFACTS_DIR, DATA_TRANSFORMATION_ARTIFACTS_DIR
+            os.getcwd(), artifacts_dir, DATA_TRANSFORMATION_ARTIFACTS_DIR
         )
+        self.DATA_FORMAT = INTERMEDIATE_DATA_FORMAT
         self.TRANSFORMED_FILE_PATH = os.path.join(
-            self.DATA_TRANSFORMATION_ARTIFACTS_DIR, TRANSFORMED_FILE_NAME
+            self.DATA_TRANSFORMATION_ARTIFACTS_DIR, data_file_name(TRANSFORMED_FILE_NAME, self.DATA_FORMAT)
+        )
+        self.STEM_TABLE_FILE_PATH = os.path.join(
+            self.DATA_TRANSFORMATION_ARTIFACTS_DIR, STEM_TABLE_FILE_NAME
         )
         self.ID = ID
         self.AXIS = AXIS
@@ -39,22 +47,47 @@ class DataTransformationConfig:
         self.CLASS = CLASS
         self.LABEL = LABEL
         self.TWEET = TWEET
+        # Explicit column types, so columnar files load back without re-parsing
+        self.DTYPES = {TWEET: str, LABEL: "int8"}
+        self.WORKERS = TRANSFORMATION_WORKERS
+        self.CHUNK_SIZE = TRANSFORMATION_CHUNK_SIZE
+        self.MODE = TRANSFORMATION_MODE
+        self.PROGRESS_ROWS = TRANSFORMATION_PROGRESS_ROWS
 
 
 @dataclass
 class ModelTrainerConfig:
-    def __init__(self):
+    def __init__(self, artifacts_dir: str = ARTIFACTS_DIR):
         self.TRAINED_MODEL_DIR: str = os.path.join(
-            os.getcwd(), ARTIFACTS_DIR, MODEL_TRAINER_ARTIFACTS_DIR
+            os.getcwd(), artifacts_dir, MODEL_TRAINER_ARTIFACTS_DIR
         )
         self.TRAINED_MODEL_PATH = os.path.join(
             self.TRAINED_MODEL_DIR, TRAINED_MODEL_NAME
         )
-        self.X_TEST_DATA_PATH = os.path.join(self.TRAINED_MODEL_DIR, X_TEST_FILE_NAME)
-        self.Y_TEST_DATA_PATH = os.path.join(self.TRAINED_MODEL_DIR, Y_TEST_FILE_NAME)
-        self.X_TRAIN_DATA_PATH = os.path.join(self.TRAINED_MODEL_DIR, X_TRAIN_FILE_NAME)
+        self.DATA_FORMAT = INTERMEDIATE_DATA_FORMAT
+        self.X_TEST_DATA_PATH = os.path.join(self.TRAINED_MODEL_DIR, data_file_name(X_TEST_FILE_NAME, self.DATA_FORMAT))
+        self.Y_TEST_DATA_PATH = os.path.join(self.TRAINED_MODEL_DIR, data_file_name(Y_TEST_FILE_NAME, self.DATA_FORMAT))
+        self.X_TRAIN_DATA_PATH = os.path.join(self.TRAINED_MODEL_DIR, data_file_name(X_TRAIN_FILE_NAME, self.DATA_FORMAT))
+        self.Y_TRAIN_DATA_PATH = os.path.join(self.TRAINED_MODEL_DIR, data_file_name(Y_TRAIN_FILE_NAME, self.DATA_FORMAT))
+        self.DTYPES = {TWEET: str, LABEL: "int8"}
+        self.TOKEN_STORAGE = TOKEN_STORAGE
+        if self.TOKEN_STORAGE not in ("dense", "ragged"):
+            raise ValueError(f"Unknown token storage: {self.TOKEN_STORAGE}")
+        ragged = self.TOKEN_STORAGE == "ragged"
+        self.X_TRAIN_SEQUENCES_PATH = os.path.join(
+            self.TRAINED_MODEL_DIR, X_TRAIN_TOKENS_DIR_NAME if ragged else X_TRAIN_SEQUENCES_FILE_NAME
+        )
+        self.X_TEST_SEQUENCES_PATH = os.path.join(
+            self.TRAINED_MODEL_DIR, X_TEST_TOKENS_DIR_NAME if ragged else X_TEST_SEQUENCES_FILE_NAME
+        )
+        self.TOKENIZER_PATH = os.path.join(self.TRAINED_MODEL_DIR, TOKENIZER_FILE_NAME)
+        self.STEM_TABLE_PATH = os.path.join(self.TRAINED_MODEL_DIR, STEM_TABLE_FILE_NAME)
         self.MAX_WORDS = MAX_WORDS
+        self.MIN_WORD_FREQUENCY = MIN_WORD_FREQUENCY
         self.MAX_LEN = MAX_LEN
+        self.MAX_LEN_PERCENTILE = MAX_LEN_PERCENTILE
+        if not 0 < self.MAX_LEN_PERCENTILE <= 100:
+            raise ValueError(f"MAX_LEN_PERCENTILE must be in (0, 100], got {self.MAX_LEN_PERCENTILE}")
         self.LOSS = LOSS
         self.METRICS = METRICS
         self.ACTIVATION = ACTIVATION
@@ -68,9 +101,9 @@ class ModelTrainerConfig:
 
 @dataclass
 class ModelEvaluationConfig:
-    def __init__(self):
+    def __init__(self, artifacts_dir: str = ARTIFACTS_DIR):
         self.MODEL_EVALUATION_MODEL_DIR: str = os.path.join(
-            os.getcwd(), ARTIFACTS_DIR, MODEL_EVALUATION_ARTIFACTS_DIR
+            os.getcwd(), artifacts_dir, MODEL_EVALUATION_ARTIFACTS_DIR
         )
         self.BEST_MODEL_DIR_PATH: str = os.path.join(
             self.MODEL_EVALUATION_MODEL_DIR, BEST_MODEL_DIR
@@ -80,9 +113,30 @@ class ModelEvaluationConfig:
 
 @dataclass
 class ModelPusherConfig:
-    def __init__(self):
+    def __init__(self, artifacts_dir: str = ARTIFACTS_DIR):
         self.TRAINED_MODEL_PATH = os.path.join(
-            os.getcwd(), ARTIFACTS_DIR, MODEL_TRAINER_ARTIFACTS_DIR, MODEL_NAME
+            os.getcwd(), artifacts_dir, MODEL_TRAINER_ARTIFACTS_DIR, MODEL_NAME
         )
         self.MODEL_NAME = MODEL_NAME
-        self.PUSHED_MODEL_DIR = os.path.join(os.getcwd(), ARTIFACTS_DIR, "pushed_model")
+        self.TOKENIZER_FILE_NAME = TOKENIZER_FILE_NAME
+        self.COMPILED_MODEL_NAME = COMPILED_MODEL_NAME
+        self.QUANTIZED_MODEL_NAME = QUANTIZED_MODEL_NAME
+        self.QUANTIZATION_REPORT_NAME = QUANTIZATION_REPORT_NAME
+        self.WEIGHT_STORE_DIR_NAME = WEIGHT_STORE_DIR_NAME
+        self.VOCABULARY_FILE_NAME = VOCABULARY_FILE_NAME
+        self.STEM_TABLE_FILE_NAME = STEM_TABLE_FILE_NAME
+        self.MODEL_METADATA_FILE_NAME = MODEL_METADATA_FILE_NAME
+        self.PUSHED_MODEL_DIR = os.path.join(os.getcwd(), artifacts_dir, "pushed_model")
+
+
+@dataclass
+class PredictionServingConfig:
+    def __init__(self):
+        self.MAX_BATCH_SIZE = PREDICT_MAX_BATCH_SIZE
+        self.MAX_WAIT_MS = PREDICT_MAX_WAIT_MS
+        self.BATCH_MAX_ITEMS = BATCH_PREDICT_MAX_ITEMS
+        self.BATCH_INFERENCE_SIZE = BATCH_PREDICT_INFERENCE_SIZE
+        self.STREAM_CHUNK_SIZE = STREAM_PREDICT_CHUNK_SIZE
+        self.INFERENCE_WORKERS = INFERENCE_WORKERS
+        self.INFERENCE_MAX_PENDING = INFERENCE_MAX_PENDING
+        self.MODEL_RELOAD_INTERVAL_S = MODEL_RELOAD_INTERVAL_S
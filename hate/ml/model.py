@@ -13,15 +13,19 @@ class ModelArchitecture:
         """
         pass
 
-    def get_model(self):
+    def get_model(self, input_dim: int = MAX_WORDS, input_length: int = MAX_LEN):
         """
         Builds and compiles an LSTM-based Sequential Keras model.
 
+        Args:
+            input_dim (int): Embedding rows, i.e. the tokenizer's used vocabulary size.
+            input_length (int): Padded sequence length.
+
         Returns:
             model (keras.Model): Compiled Keras model.
         """
         model = Sequential()
-        model.add(Embedding(input_dim=MAX_WORDS, output_dim=100, input_length=MAX_LEN))
+        model.add(Embedding(input_dim=input_dim, output_dim=100, input_length=input_length))
         model.add(SpatialDropout1D(0.2))
         model.add(LSTM(units=100, dropout=0.2, recurrent_dropout=0.2))
         model.add(Dense(1, activation=ACTIVATION))
@@ -0,0 +1,284 @@
+# numpy_lstm.py - TensorFlow-free inference for the ModelArchitecture LSTM stack
+
+import json
+import h5py
+import numpy as np
+
+
+def _sigmoid(x):
+    # tanh form avoids overflow warnings from exp() on large negative inputs
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+ACTIVATIONS = {
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0),
+    "linear": lambda x: x,
+}
+
+
+def _activation(name: str):
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy backend: {name}")
+    return ACTIVATIONS[name]
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class LSTMWeights:
+    """
+    Weights of the Embedding -> SpatialDropout1D -> LSTM -> Dense stack.
+
+    Dropout layers have no weights and are no-ops at inference time. A compiled set of
+    weights replaces embeddings, kernel and bias with gate_table, the
+    (vocab_size, 4 * units) pre-projected input gates for every token. Quantized weights
+    keep embeddings as int8 with one float scale per row in embedding_scale.
+    """
+    def __init__(self, embeddings, kernel, recurrent_kernel, bias, dense_kernel, dense_bias,
+                 maxlen: int, activation: str = "tanh", recurrent_activation: str = "sigmoid",
+                 dense_activation: str = "sigmoid", gate_table=None, embedding_scale=None):
+        self.embeddings = embeddings
+        self.embedding_scale = embedding_scale
+        self.kernel = kernel
+        self.recurrent_kernel = recurrent_kernel
+        self.bias = bias
+        self.gate_table = gate_table
+        self.dense_kernel = dense_kernel
+        self.dense_bias = dense_bias
+        self.maxlen = maxlen
+        self.activation = activation
+        self.recurrent_activation = recurrent_activation
+        self.dense_activation = dense_activation
+
+    @property
+    def units(self) -> int:
+        return self.recurrent_kernel.shape[0]
+
+    @classmethod
+    def from_h5(cls, model_path: str) -> "LSTMWeights":
+        """
+        Reads the layer weights and config straight from a Keras HDF5 model file.
+        """
+        with h5py.File(model_path, "r") as f:
+            model_config = json.loads(_decode(f.attrs["model_config"]))
+            layer_configs = {layer["config"]["name"]: layer for layer in model_config["config"]["layers"]}
+
+            weights_group = f["model_weights"] if "model_weights" in f else f
+            weights_by_class = {}
+            for layer_name in weights_group.attrs["layer_names"]:
+                layer_name = _decode(layer_name)
+                layer_group = weights_group[layer_name]
+                weight_names = [_decode(name) for name in layer_group.attrs["weight_names"]]
+                if not weight_names:
+                    continue
+                class_name = layer_configs[layer_name]["class_name"]
+                weights_by_class[class_name] = (
+                    [np.asarray(layer_group[name], dtype=np.float32) for name in weight_names],
+                    layer_configs[layer_name]["config"]
+                )
+
+        (embeddings,), embedding_config = weights_by_class["Embedding"]
+        (kernel, recurrent_kernel, bias), lstm_config = weights_by_class["LSTM"]
+        (dense_kernel, dense_bias), dense_config = weights_by_class["Dense"]
+
+        maxlen = embedding_config.get("input_length")
+        if maxlen is None:
+            maxlen = embedding_config["batch_input_shape"][1]
+
+        return cls(
+            embeddings=embeddings,
+            kernel=kernel,
+            recurrent_kernel=recurrent_kernel,
+            bias=bias,
+            dense_kernel=dense_kernel,
+            dense_bias=dense_bias,
+            maxlen=int(maxlen),
+            activation=lstm_config.get("activation", "tanh"),
+            recurrent_activation=lstm_config.get("recurrent_activation", "sigmoid"),
+            dense_activation=dense_config.get("activation", "sigmoid"),
+        )
+
+    def metadata(self) -> dict:
+        return {
+            "maxlen": self.maxlen,
+            "activation": self.activation,
+            "recurrent_activation": self.recurrent_activation,
+            "dense_activation": self.dense_activation,
+        }
+
+    def compiled(self) -> "LSTMWeights":
+        """
+        Folds the embedding lookup and input projection into one table: gate_table[t] = E[t] @ W + b.
+        """
+        if self.gate_table is not None:
+            return self
+        if self.embedding_scale is not None:
+            raise ValueError("Quantized weights cannot be compiled into a gate table")
+        return LSTMWeights(
+            embeddings=None,
+            kernel=None,
+            recurrent_kernel=self.recurrent_kernel,
+            bias=None,
+            dense_kernel=self.dense_kernel,
+            dense_bias=self.dense_bias,
+            gate_table=(self.embeddings @ self.kernel + self.bias).astype(np.float32),
+            **self.metadata()
+        )
+
+    def save_compiled(self, output_path: str) -> None:
+        compiled = self.compiled()
+        np.savez(
+            output_path,
+            gate_table=compiled.gate_table,
+            recurrent_kernel=compiled.recurrent_kernel,
+            dense_kernel=compiled.dense_kernel,
+            dense_bias=compiled.dense_bias,
+            metadata=np.array(json.dumps(compiled.metadata()))
+        )
+
+    @classmethod
+    def from_compiled(cls, compiled_path: str) -> "LSTMWeights":
+        with np.load(compiled_path, allow_pickle=False) as bundle:
+            return cls.from_arrays(bundle, json.loads(str(bundle["metadata"])), compiled=True)
+
+    def float_arrays(self) -> dict:
+        return {
+            "embeddings": self.embeddings,
+            "kernel": self.kernel,
+            "recurrent_kernel": self.recurrent_kernel,
+            "bias": self.bias,
+            "dense_kernel": self.dense_kernel,
+            "dense_bias": self.dense_bias,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, metadata: dict, compiled: bool = False) -> "LSTMWeights":
+        """
+        Builds weights from named arrays (an npz bundle or a mapped weight store).
+        """
+        return cls(
+            embeddings=None if compiled else arrays["embeddings"],
+            kernel=None if compiled else arrays["kernel"],
+            recurrent_kernel=arrays["recurrent_kernel"],
+            bias=None if compiled else arrays["bias"],
+            dense_kernel=arrays["dense_kernel"],
+            dense_bias=arrays["dense_bias"],
+            gate_table=arrays["gate_table"] if compiled else None,
+            **metadata
+        )
+
+
+class NumpyLSTMModel:
+    """
+    Vectorized NumPy forward pass over batches of padded token sequences.
+
+    Sequences are pre-padded with token 0, and with fixed weights the LSTM state after
+    k padding tokens is a constant. Those states are computed once at load time, so a
+    batch starts its recurrence at its first real token instead of stepping through
+    the padding.
+    """
+    def __init__(self, weights: LSTMWeights):
+        self.weights = weights
+        self.maxlen = weights.maxlen
+        self._activation = _activation(weights.activation)
+        self._recurrent_activation = _activation(weights.recurrent_activation)
+        self._dense_activation = _activation(weights.dense_activation)
+        self.zero_prefix_h, self.zero_prefix_c = self._zero_prefix_states()
+
+    def _zero_prefix_states(self):
+        """
+        Hidden and cell states after k = 0..maxlen padding tokens, each of shape (maxlen + 1, units).
+        """
+        w = self.weights
+        h = np.zeros((1, w.units), dtype=np.float32)
+        c = np.zeros_like(h)
+        hs, cs = [h[0]], [c[0]]
+        gates_input = self._input_gates(np.zeros((1,), dtype=np.int64))
+        for _ in range(self.maxlen):
+            h, c = self._step(gates_input, h, c)
+            hs.append(h[0])
+            cs.append(c[0])
+        return np.stack(hs), np.stack(cs)
+
+    def _input_gates(self, tokens: np.ndarray) -> np.ndarray:
+        w = self.weights
+        if w.gate_table is not None:
+            # Compiled weights: one row gather replaces the embedding lookup and input matmul
+            return w.gate_table[tokens]
+        if w.embedding_scale is not None:
+            # Int8 embedding: dequantize only the gathered rows
+            x = w.embeddings[tokens].astype(np.float32) * w.embedding_scale[tokens][:, None]
+            return x @ w.kernel + w.bias
+        return w.embeddings[tokens] @ w.kernel + w.bias
+
+    @classmethod
+    def from_h5(cls, model_path: str) -> "NumpyLSTMModel":
+        return cls(LSTMWeights.from_h5(model_path))
+
+    @classmethod
+    def from_compiled(cls, compiled_path: str) -> "NumpyLSTMModel":
+        return cls(LSTMWeights.from_compiled(compiled_path))
+
+    def _step(self, gates_input, h, c):
+        """
+        One LSTM timestep. Keras packs the gates as [input, forget, cell, output].
+        """
+        w = self.weights
+        units = w.units
+        z = gates_input + h @ w.recurrent_kernel
+        i = self._recurrent_activation(z[:, :units])
+        f = self._recurrent_activation(z[:, units:2 * units])
+        g = self._activation(z[:, 2 * units:3 * units])
+        o = self._recurrent_activation(z[:, 3 * units:])
+        c = f * c + i * g
+        h = o * self._activation(c)
+        return h, c
+
+    def _forward(self, tokens: np.ndarray, start: int) -> np.ndarray:
+        """
+        :param tokens: Padded batch whose first `start` columns are all padding
+        :param start: Number of leading padding steps to skip
+        """
+        w = self.weights
+        h = np.repeat(self.zero_prefix_h[start][None, :], tokens.shape[0], axis=0)
+        c = np.repeat(self.zero_prefix_c[start][None, :], tokens.shape[0], axis=0)
+        for t in range(start, tokens.shape[1]):
+            h, c = self._step(self._input_gates(tokens[:, t]), h, c)
+        return self._dense_activation(h @ w.dense_kernel + w.dense_bias)
+
+    def predict(self, padded: np.ndarray, batch_size: int = 256) -> np.ndarray:
+        """
+        :param padded: Integer array of shape (n, maxlen)
+        :param batch_size: Rows per vectorized forward pass
+        :return: Array of shape (n, 1) with sigmoid scores
+        """
+        padded = np.asarray(padded)
+        if len(padded) == 0:
+            return np.zeros((0, 1), dtype=np.float32)
+
+        # Leading padding per row; all-padding rows skip every step
+        nonzero = padded != 0
+        leading = np.where(nonzero.any(axis=1), nonzero.argmax(axis=1), padded.shape[1])
+
+        # Group rows of similar length so each batch skips as much padding as possible
+        order = np.argsort(-leading, kind="stable")
+        outputs = np.empty((len(padded), 1), dtype=np.float32)
+        for begin in range(0, len(padded), batch_size):
+            rows = order[begin:begin + batch_size]
+            start = int(leading[rows].min())
+            outputs[rows] = self._forward(padded[rows], start)
+        return outputs
+
+
+def compare_with_keras(model_path: str, padded: np.ndarray) -> float:
+    """
+    Numerical parity check: max absolute difference between Keras and NumPy scores.
+    """
+    import keras
+
+    keras_scores = keras.models.load_model(model_path).predict(padded, verbose=0)
+    numpy_scores = NumpyLSTMModel.from_h5(model_path).predict(padded)
+    return float(np.max(np.abs(keras_scores - numpy_scores)))
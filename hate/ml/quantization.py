@@ -0,0 +1,102 @@
+# quantization.py - Int8 post-training quantization of the LSTM serving weights
+
+import json
+import numpy as np
+from hate.ml.numpy_lstm import LSTMWeights, NumpyLSTMModel
+
+
+def _scales(max_abs: np.ndarray) -> np.ndarray:
+    scale = (max_abs / 127.0).astype(np.float32)
+    scale[scale == 0] = 1.0
+    return scale
+
+
+def quantize_per_row(matrix: np.ndarray):
+    """
+    Symmetric int8 quantization with one scale per row (used for the embedding table).
+
+    :return: Tuple of (int8 matrix, float32 scales of shape (rows,))
+    """
+    scale = _scales(np.abs(matrix).max(axis=1))
+    q = np.clip(np.round(matrix / scale[:, None]), -127, 127).astype(np.int8)
+    return q, scale
+
+
+def quantize_per_column(matrix: np.ndarray):
+    """
+    Symmetric int8 quantization with one scale per output channel (used for kernels).
+
+    :return: Tuple of (int8 matrix, float32 scales of shape (columns,))
+    """
+    scale = _scales(np.abs(matrix).max(axis=0))
+    q = np.clip(np.round(matrix / scale[None, :]), -127, 127).astype(np.int8)
+    return q, scale
+
+
+def quantize_weights(weights: LSTMWeights) -> dict:
+    """
+    Int8 arrays with per-row embedding scales and per-channel kernel scales. Biases and the
+    tiny Dense layer stay float32.
+    """
+    embeddings_q, embeddings_scale = quantize_per_row(weights.embeddings)
+    kernel_q, kernel_scale = quantize_per_column(weights.kernel)
+    recurrent_kernel_q, recurrent_kernel_scale = quantize_per_column(weights.recurrent_kernel)
+    return {
+        "embeddings_q": embeddings_q,
+        "embeddings_scale": embeddings_scale,
+        "kernel_q": kernel_q,
+        "kernel_scale": kernel_scale,
+        "recurrent_kernel_q": recurrent_kernel_q,
+        "recurrent_kernel_scale": recurrent_kernel_scale,
+        "bias": weights.bias,
+        "dense_kernel": weights.dense_kernel,
+        "dense_bias": weights.dense_bias,
+    }
+
+
+def save_quantized(weights: LSTMWeights, output_path: str) -> None:
+    np.savez(output_path, metadata=np.array(json.dumps(weights.metadata())), **quantize_weights(weights))
+
+
+def from_quantized_arrays(arrays, metadata: dict) -> LSTMWeights:
+    """
+    Builds int8 weights for NumpyLSTMModel.
+
+    The embedding stays int8 and only the gathered rows are dequantized at each step. The LSTM
+    kernels are dequantized here, since they are a small fraction of the weights.
+    """
+    return LSTMWeights(
+        embeddings=arrays["embeddings_q"],
+        embedding_scale=arrays["embeddings_scale"],
+        kernel=arrays["kernel_q"].astype(np.float32) * arrays["kernel_scale"][None, :],
+        recurrent_kernel=arrays["recurrent_kernel_q"].astype(np.float32) * arrays["recurrent_kernel_scale"][None, :],
+        bias=arrays["bias"],
+        dense_kernel=arrays["dense_kernel"],
+        dense_bias=arrays["dense_bias"],
+        **metadata
+    )
+
+
+def load_quantized(quantized_path: str) -> LSTMWeights:
+    with np.load(quantized_path, allow_pickle=False) as bundle:
+        return from_quantized_arrays(bundle, json.loads(str(bundle["metadata"])))
+
+
+def quantization_report(float_model: NumpyLSTMModel, quantized_model: NumpyLSTMModel,
+                        padded: np.ndarray, labels: np.ndarray) -> dict:
+    """
+    Accuracy of the float and int8 models on the same padded test set.
+    """
+    labels = np.asarray(labels).reshape(-1)
+    float_scores = float_model.predict(padded)[:, 0]
+    quantized_scores = quantized_model.predict(padded)[:, 0]
+    float_accuracy = float(np.mean((float_scores >= 0.5) == labels))
+    quantized_accuracy = float(np.mean((quantized_scores >= 0.5) == labels))
+    return {
+        "rows": int(len(labels)),
+        "float_accuracy": float_accuracy,
+        "int8_accuracy": quantized_accuracy,
+        "accuracy_delta": quantized_accuracy - float_accuracy,
+        "max_abs_score_diff": float(np.max(np.abs(float_scores - quantized_scores))) if len(labels) else 0.0,
+        "label_agreement": float(np.mean((float_scores >= 0.5) == (quantized_scores >= 0.5))) if len(labels) else 1.0,
+    }
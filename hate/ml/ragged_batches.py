@@ -0,0 +1,42 @@
+# ragged_batches.py - Padded Keras batches generated on demand from ragged token storage
+
+import math
+import numpy as np
+import keras
+from hate.preprocessing.ragged import RaggedTokens
+
+
+class PaddedBatchSequence(keras.utils.Sequence):
+    """
+    Feeds model.fit / evaluate / predict from RaggedTokens, padding one batch at a time, so the
+    dense (rows, maxlen) matrix never exists in memory.
+    """
+    def __init__(self, tokens: RaggedTokens, maxlen: int, labels=None, rows=None, batch_size: int = 128,
+                 shuffle: bool = False, seed: int = 42):
+        """
+        :param maxlen: Padded sequence length, the input length of the model being fed
+        """
+        super().__init__()
+        self.tokens = tokens
+        self.labels = None if labels is None else np.asarray(labels)
+        self.rows = np.arange(len(tokens)) if rows is None else np.array(rows)
+        self.batch_size = batch_size
+        self.maxlen = maxlen
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+        if shuffle:
+            self._rng.shuffle(self.rows)
+
+    def __len__(self) -> int:
+        return math.ceil(len(self.rows) / self.batch_size)
+
+    def __getitem__(self, index: int):
+        batch_rows = self.rows[index * self.batch_size:(index + 1) * self.batch_size]
+        x = self.tokens.pad(self.maxlen, batch_rows)
+        if self.labels is None:
+            return x
+        return x, self.labels[batch_rows]
+
+    def on_epoch_end(self) -> None:
+        if self.shuffle:
+            self._rng.shuffle(self.rows)
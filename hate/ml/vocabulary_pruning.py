@@ -0,0 +1,114 @@
+# vocabulary_pruning.py - Size the embedding table to the tokenizer's used vocabulary
+
+import os
+import sys
+import pickle
+from hate.logger import logging
+from hate.exception import CustomException
+from hate.constants import (
+    MAX_WORDS,
+    MODEL_NAME,
+    TOKENIZER_FILE_NAME,
+    COMPILED_MODEL_NAME,
+    QUANTIZED_MODEL_NAME,
+    WEIGHT_STORE_DIR_NAME,
+    VOCABULARY_FILE_NAME,
+    MODEL_METADATA_FILE_NAME
+)
+
+# Derived from model.h5 / tokenizer.pickle by the pusher and preferred by serving, so they
+# would go stale next to a pruned model
+SERVING_ARTIFACT_NAMES = (
+    COMPILED_MODEL_NAME,
+    QUANTIZED_MODEL_NAME,
+    WEIGHT_STORE_DIR_NAME,
+    VOCABULARY_FILE_NAME,
+    MODEL_METADATA_FILE_NAME,
+)
+
+
+def vocabulary_size(tokenizer, max_words: int = MAX_WORDS, min_frequency: int = 1) -> int:
+    """
+    Number of embedding rows the fitted tokenizer can actually emit (index 0 is padding).
+
+    Keras assigns word indices by descending frequency, so the words that clear
+    min_frequency are exactly the indices 1..kept.
+    """
+    kept = sum(1 for count in tokenizer.word_counts.values() if count >= min_frequency)
+    return max(2, min(max_words, kept + 1))
+
+
+def restrict_tokenizer(tokenizer, vocab_size: int):
+    """
+    Limits the tokenizer to indices below vocab_size and drops bookkeeping for the rest.
+    """
+    tokenizer.num_words = vocab_size
+    dropped = [w for w, i in tokenizer.word_index.items() if i >= vocab_size]
+    for word in dropped:
+        index = tokenizer.word_index.pop(word)
+        tokenizer.index_word.pop(index, None)
+        tokenizer.index_docs.pop(index, None)
+        tokenizer.word_counts.pop(word, None)
+        tokenizer.word_docs.pop(word, None)
+    return tokenizer
+
+
+def prune_model_vocabulary(model_path: str, tokenizer_path: str, output_model_path: str,
+                           output_tokenizer_path: str, min_frequency: int = 1) -> dict:
+    """
+    Drops unused embedding rows from an existing model and remaps the tokenizer to match.
+
+    Kept words keep their indices, so only the tail of the embedding table is removed.
+    Refuses to write next to pushed serving artifacts, which would no longer match the model;
+    write to a fresh directory and push from there instead.
+    """
+    try:
+        for output_path in (output_model_path, output_tokenizer_path):
+            output_dir = os.path.dirname(os.path.abspath(output_path))
+            stale = [name for name in SERVING_ARTIFACT_NAMES if os.path.exists(os.path.join(output_dir, name))]
+            if stale:
+                raise FileExistsError(
+                    f"{output_dir} holds serving artifacts {stale} built from another model; "
+                    f"write the pruned model to an empty directory"
+                )
+
+        import keras
+        from hate.ml.model import ModelArchitecture
+
+        with open(tokenizer_path, 'rb') as handle:
+            tokenizer = pickle.load(handle)
+        model = keras.models.load_model(model_path)
+
+        weights = model.get_weights()
+        old_rows, _ = weights[0].shape
+        maxlen = model.input_shape[1]
+        vocab_size = min(old_rows, vocabulary_size(tokenizer, old_rows, min_frequency))
+
+        pruned_model = ModelArchitecture().get_model(input_dim=vocab_size, input_length=maxlen)
+        pruned_model.set_weights([weights[0][:vocab_size], *weights[1:]])
+        pruned_model.save(output_model_path)
+
+        restrict_tokenizer(tokenizer, vocab_size)
+        with open(output_tokenizer_path, 'wb') as handle:
+            pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+        summary = {"original_rows": int(old_rows), "pruned_rows": int(vocab_size), "min_frequency": min_frequency}
+        logging.info(f"✂️ Pruned embedding table: {summary}")
+        return summary
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    # Usage: python -m hate.ml.vocabulary_pruning <pushed_model_dir> <output_dir> [min_frequency]
+    # output_dir must not hold compiled, int8, weight store or vocabulary files from an earlier push
+    source_dir, output_dir = sys.argv[1], sys.argv[2]
+    min_frequency = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    os.makedirs(output_dir, exist_ok=True)
+    print(prune_model_vocabulary(
+        model_path=os.path.join(source_dir, MODEL_NAME),
+        tokenizer_path=os.path.join(source_dir, TOKENIZER_FILE_NAME),
+        output_model_path=os.path.join(output_dir, MODEL_NAME),
+        output_tokenizer_path=os.path.join(output_dir, TOKENIZER_FILE_NAME),
+        min_frequency=min_frequency
+    ))
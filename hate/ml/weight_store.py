@@ -0,0 +1,62 @@
+# weight_store.py - Pickle-free, memory-mappable weight format shared across worker processes
+
+import os
+import json
+import numpy as np
+
+WEIGHT_STORE_FORMAT_VERSION = 1
+HEADER_FILE_NAME = "header.json"
+
+
+def save_weight_store(directory: str, arrays: dict, metadata: dict) -> str:
+    """
+    Writes each array as its own .npy file plus a small JSON header describing them.
+
+    .npy payloads start on a 64-byte aligned offset, so they can be mapped directly.
+
+    :return: Path of the header file
+    """
+    os.makedirs(directory, exist_ok=True)
+    entries = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        file_name = f"{name}.npy"
+        np.save(os.path.join(directory, file_name), array, allow_pickle=False)
+        entries[name] = {"file": file_name, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+    header_path = os.path.join(directory, HEADER_FILE_NAME)
+    header = {"format_version": WEIGHT_STORE_FORMAT_VERSION, "metadata": metadata, "arrays": entries}
+    # Header goes last so a half-written store is never picked up
+    tmp_path = header_path + ".tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump(header, handle, indent=2)
+    os.replace(tmp_path, header_path)
+    return header_path
+
+
+def load_weight_store(directory: str, names=None, mmap: bool = True):
+    """
+    Maps the stored arrays read-only, so every worker on a host shares one copy through the page cache.
+
+    :param names: Optional subset of array names to load
+    :return: Tuple of (dict of arrays, metadata dict)
+    """
+    with open(os.path.join(directory, HEADER_FILE_NAME)) as handle:
+        header = json.load(handle)
+    if header["format_version"] != WEIGHT_STORE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported weight store version: {header['format_version']}")
+
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        if names is not None and name not in names:
+            continue
+        array = np.load(os.path.join(directory, entry["file"]), mmap_mode="r" if mmap else None,
+                        allow_pickle=False)
+        if array.dtype.str != entry["dtype"] or list(array.shape) != entry["shape"]:
+            raise ValueError(f"Weight store entry {name} does not match its header")
+        arrays[name] = array
+    return arrays, header["metadata"]
+
+
+def has_weight_store(directory: str) -> bool:
+    return os.path.exists(os.path.join(directory, HEADER_FILE_NAME))
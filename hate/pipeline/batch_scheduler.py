@@ -0,0 +1,134 @@
+import asyncio
+import time
+from hate.logger import logging
+
+
+class SchedulerMetrics:
+    """
+    Running counters for the micro-batching scheduler.
+    """
+    def __init__(self):
+        self.total_batches = 0
+        self.total_requests = 0
+        self.last_batch_size = 0
+        self.max_batch_size_seen = 0
+        self.total_queue_wait_ms = 0.0
+        self.max_queue_wait_ms = 0.0
+        self.total_inference_ms = 0.0
+        self.failed_batches = 0
+
+    def record_batch(self, batch_size: int, queue_waits_ms, inference_ms: float) -> None:
+        self.total_batches += 1
+        self.total_requests += batch_size
+        self.last_batch_size = batch_size
+        self.max_batch_size_seen = max(self.max_batch_size_seen, batch_size)
+        self.total_queue_wait_ms += sum(queue_waits_ms)
+        self.max_queue_wait_ms = max([self.max_queue_wait_ms, *queue_waits_ms])
+        self.total_inference_ms += inference_ms
+
+    def as_dict(self) -> dict:
+        batches = max(self.total_batches, 1)
+        requests = max(self.total_requests, 1)
+        return {
+            "total_batches": self.total_batches,
+            "total_requests": self.total_requests,
+            "failed_batches": self.failed_batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_seen": self.max_batch_size_seen,
+            "avg_batch_size": round(self.total_requests / batches, 3),
+            "avg_queue_wait_ms": round(self.total_queue_wait_ms / requests, 3),
+            "max_queue_wait_ms": round(self.max_queue_wait_ms, 3),
+            "avg_inference_ms": round(self.total_inference_ms / batches, 3),
+        }
+
+
+class MicroBatchScheduler:
+    """
+    Collects concurrent single-text predictions into one padded batch.
+
+    A batch is flushed when it reaches max_batch_size or when the oldest request has
+    waited max_wait_ms, whichever comes first. The batch runs as a single forward pass
+    and each row's score is routed back to the caller that submitted it.
+    """
+    def __init__(self, predict_fn, max_batch_size: int, max_wait_ms: float, inference_executor):
+        """
+        :param predict_fn: Blocking callable taking a list of texts and returning a list of scores
+        :param max_batch_size: Maximum number of texts per forward pass
+        :param max_wait_ms: Maximum time the first request of a batch waits for company
+        :param inference_executor: InferenceExecutor that runs predict_fn off the event loop
+        """
+        self.predict_fn = predict_fn
+        self.inference_executor = inference_executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.metrics = SchedulerMetrics()
+        self._queue = None
+        self._task = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logging.info(f"🧺 Micro-batch scheduler started "
+                     f"(max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait_s * 1000})")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logging.info("🛑 Micro-batch scheduler stopped")
+
+    async def submit(self, text: str) -> float:
+        """
+        Queues one text and waits for its score.
+        """
+        if self._task is None:
+            raise RuntimeError("Micro-batch scheduler is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def _collect_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Skip callers that went away while waiting
+        return [item for item in batch if not item[1].done()]
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            if not batch:
+                continue
+
+            texts = [text for text, _, _ in batch]
+            started = time.perf_counter()
+            queue_waits_ms = [(started - enqueued) * 1000 for _, _, enqueued in batch]
+
+            try:
+                scores = await self.inference_executor.run(self.predict_fn, texts)
+            except Exception as e:
+                self.metrics.failed_batches += 1
+                logging.error(f"❌ Micro-batch of {len(batch)} failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.metrics.record_batch(len(batch), queue_waits_ms, (time.perf_counter() - started) * 1000)
+            for (_, future, _), score in zip(batch, scores):
+                if not future.done():
+                    future.set_result(score)
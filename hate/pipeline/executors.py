@@ -0,0 +1,33 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from hate.logger import logging
+
+
+class InferenceExecutor:
+    """
+    Bounded worker pool for blocking, CPU-bound inference calls.
+
+    The event loop only awaits results; at most max_pending calls are admitted at a
+    time, the rest wait on the loop without piling up work in the pool's queue.
+    """
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._slots = None
+        self.pending = 0
+
+    async def run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            self.pending += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            finally:
+                self.pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logging.info("🛑 Inference executor shut down")
+
@@ -0,0 +1,100 @@
+import os
+import sys
+import asyncio
+import threading
+from datetime import datetime
+from hate.logger import logging
+from hate.exception import CustomException
+from hate.pipeline.prediction_pipeline import PredictionPipeline, read_latest_model_pointer
+
+
+class ModelHolder:
+    """
+    Process-wide holder for the loaded PredictionPipeline.
+
+    The model and tokenizer are loaded once (from the FastAPI lifespan hook) and the
+    same pipeline object is shared by every request afterwards. watch() swaps in models
+    pushed later, including ones trained by a job another API worker accepted.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pipeline = None
+        self._failed_model_dir = None
+        self.loaded_at = None
+        self.load_error = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._pipeline is not None
+
+    @property
+    def artifact_version(self):
+        return self._pipeline.artifact_version if self._pipeline is not None else None
+
+    def load(self, pushed_model_dir: str = None) -> PredictionPipeline:
+        """
+        Loads a pushed model and swaps it in for all subsequent requests.
+
+        :param pushed_model_dir: pushed_model folder to load, the latest one under artifacts if None
+        """
+        with self._lock:
+            try:
+                logging.info("📦 Loading prediction pipeline into model holder...")
+                self._pipeline = PredictionPipeline(pushed_model_dir=pushed_model_dir)
+                self.loaded_at = datetime.now().isoformat()
+                self.load_error = None
+                logging.info(f"✅ Model holder ready with artifact version {self._pipeline.artifact_version}")
+                return self._pipeline
+            except Exception as e:
+                self.load_error = str(e)
+                logging.error(f"❌ Model holder failed to load: {e}")
+                raise CustomException(e, sys)
+
+    def reload_if_updated(self) -> bool:
+        """
+        Loads the model the latest-model pointer names if it is not the one being served.
+
+        :return: True if a new model was swapped in
+        """
+        pushed_model_dir = read_latest_model_pointer()
+        if pushed_model_dir is None:
+            return False
+        pushed_model_dir = os.path.abspath(pushed_model_dir)
+        current = self._pipeline.pushed_model_dir if self._pipeline is not None else None
+        if pushed_model_dir in (current, self._failed_model_dir):
+            return False
+
+        logging.info(f"🔄 New pushed model at {pushed_model_dir}")
+        try:
+            self.load(pushed_model_dir)
+        except CustomException:
+            # Keep serving the current model and don't retry the same broken push every interval
+            self._failed_model_dir = pushed_model_dir
+            return False
+        self._failed_model_dir = None
+        return True
+
+    async def watch(self, interval_s: float) -> None:
+        """
+        Checks the latest-model pointer every interval_s seconds until cancelled.
+        """
+        while True:
+            await asyncio.sleep(interval_s)
+            await asyncio.to_thread(self.reload_if_updated)
+
+    def get_pipeline(self) -> PredictionPipeline:
+        if self._pipeline is None:
+            raise RuntimeError("Model is not loaded yet. Train and push a model, then retry.")
+        return self._pipeline
+
+    def status(self) -> dict:
+        return {
+            "ready": self.is_ready,
+            "artifact_version": self.artifact_version,
+            "loaded_at": self.loaded_at,
+            "error": self.load_error,
+        }
+
+
+# Shared by every request handled in this process
+model_holder = ModelHolder()
@@ -1,58 +1,214 @@
 import os
 import sys
-import keras
+import json
+import time
 import pickle
-import re
 from hate.logger import logging
 from hate.exception import CustomException
-from keras.utils import pad_sequences
+from hate.constants import (
+    INFERENCE_BACKEND,
+    COMPILED_MODEL_NAME,
+    QUANTIZED_MODEL_NAME,
+    WEIGHT_STORE_DIR_NAME,
+    VOCABULARY_FILE_NAME,
+    STEM_TABLE_FILE_NAME,
+    TOKENIZER_FILE_NAME,
+    MODEL_METADATA_FILE_NAME,
+    LATEST_MODEL_FILE_NAME
+)
+from hate.preprocessing.sequences import pad_sequences
+from hate.preprocessing.vocabulary import CompactTokenizer
+from hate.preprocessing.text_normalizer import get_normalizer
+
+
+def publish_pushed_model(pushed_model_dir: str, base_artifact_path: str = "artifacts") -> str:
+    """
+    Points every API worker at a newly pushed model. The pointer file is replaced atomically.
+
+    :return: Path of the pointer file
+    """
+    pointer_path = os.path.join(base_artifact_path, LATEST_MODEL_FILE_NAME)
+    os.makedirs(base_artifact_path, exist_ok=True)
+    tmp_path = f"{pointer_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as handle:
+        json.dump({"pushed_model_dir": os.path.relpath(pushed_model_dir), "published_at": time.time()}, handle)
+    os.replace(tmp_path, pointer_path)
+    return pointer_path
+
+
+def read_latest_model_pointer(base_artifact_path: str = "artifacts"):
+    """
+    :return: pushed_model directory named by the pointer file, or None if there is no usable pointer
+    """
+    pointer_path = os.path.join(base_artifact_path, LATEST_MODEL_FILE_NAME)
+    try:
+        with open(pointer_path) as handle:
+            pushed_model_dir = json.load(handle)["pushed_model_dir"]
+    except (OSError, ValueError, KeyError):
+        return None
+    if not os.path.exists(os.path.join(pushed_model_dir, "model.h5")):
+        return None
+    return pushed_model_dir
+
+
+def get_latest_pushed_model_dir(base_artifact_path: str = "artifacts"):
+    """
+    Finds the latest pushed model: the one the pointer file names, otherwise the newest
+    timestamped artifact folder that actually contains a pushed model.
+
+    :param base_artifact_path: Root folder holding the timestamped artifact folders
+    :return: Tuple of (artifact version, pushed_model directory path)
+    """
+    pushed_model_dir = read_latest_model_pointer(base_artifact_path)
+    if pushed_model_dir is not None:
+        return os.path.basename(os.path.dirname(os.path.abspath(pushed_model_dir))), pushed_model_dir
+
+    all_folders = [f for f in os.listdir(base_artifact_path) if os.path.isdir(os.path.join(base_artifact_path, f))]
+    for folder in sorted(all_folders, reverse=True):
+        pushed_model_dir = os.path.join(base_artifact_path, folder, "pushed_model")
+        if os.path.exists(os.path.join(pushed_model_dir, "model.h5")):
+            return folder, pushed_model_dir
+    raise FileNotFoundError(f"No pushed model found under {base_artifact_path}")
 
 
 class PredictionPipeline:
-    def __init__(self):
+    def __init__(self, backend: str = INFERENCE_BACKEND, pushed_model_dir: str = None):
+        """
+        :param backend: "keras" to run the saved Keras model, "numpy" for the TensorFlow-free engine,
+                        "numpy_compiled" for the TensorFlow-free engine on the push-time compiled weights,
+                        "numpy_int8" for the TensorFlow-free engine on the int8 weight bundle
+        :param pushed_model_dir: pushed_model folder to load, the latest one under artifacts if None
+        """
         try:
-            # 🔍 Find the latest timestamped artifact folder
-            base_artifact_path = os.path.join("artifacts")
-            all_folders = [f for f in os.listdir(base_artifact_path) if os.path.isdir(os.path.join(base_artifact_path, f))]
-            latest_folder = sorted(all_folders)[-1]  # Last one (latest)
-
-            # ✅ Build absolute path to pushed_model inside latest folder
-            pushed_model_dir = os.path.join(base_artifact_path, latest_folder, "pushed_model")
+            self.backend = backend
+            # 🔍 Find the latest timestamped artifact folder with a pushed model
+            if pushed_model_dir is None:
+                self.artifact_version, pushed_model_dir = get_latest_pushed_model_dir()
+            else:
+                self.artifact_version = os.path.basename(os.path.dirname(os.path.abspath(pushed_model_dir)))
+            self.pushed_model_dir = os.path.abspath(pushed_model_dir)
             model_path = os.path.join(pushed_model_dir, "model.h5")
-            tokenizer_path = os.path.join(pushed_model_dir, "tokenizer.pickle")
 
             # 🔒 Check if files exist before loading
             if not os.path.exists(model_path):
                 raise FileNotFoundError(f"Model file not found at {model_path}")
-            if not os.path.exists(tokenizer_path):
-                raise FileNotFoundError(f"Tokenizer file not found at {tokenizer_path}")
 
-            self.model = keras.models.load_model(model_path)
-            with open(tokenizer_path, 'rb') as handle:
-                self.tokenizer = pickle.load(handle)
+            self.model = self.load_model(pushed_model_dir)
+            self.tokenizer = self.load_tokenizer(pushed_model_dir)
+            self.normalizer = get_normalizer()
+            self.load_stem_table(pushed_model_dir)
+            self.max_len = self.load_max_len(pushed_model_dir)
+
+            logging.info(f"✅ Loaded model ({self.backend} backend) and tokenizer from {pushed_model_dir}")
 
         except Exception as e:
             raise CustomException(f"❌ Error loading model/tokenizer: {e}", sys)
 
+    def load_tokenizer(self, pushed_model_dir: str):
+        # 📖 Prefer the compact vocabulary; unpickling the Keras Tokenizer is slow and runs arbitrary code
+        vocabulary_path = os.path.join(pushed_model_dir, VOCABULARY_FILE_NAME)
+        if os.path.exists(vocabulary_path):
+            return CompactTokenizer.load(vocabulary_path)
+
+        tokenizer_path = os.path.join(pushed_model_dir, TOKENIZER_FILE_NAME)
+        if not os.path.exists(tokenizer_path):
+            raise FileNotFoundError(f"Tokenizer file not found at {tokenizer_path}")
+        logging.warning(f"⚠️ {vocabulary_path} not found, unpickling {tokenizer_path}")
+        with open(tokenizer_path, 'rb') as handle:
+            return pickle.load(handle)
+
+    def load_model(self, pushed_model_dir: str):
+        model_path = os.path.join(pushed_model_dir, "model.h5")
+        if self.backend == "keras":
+            import keras
+            return keras.models.load_model(model_path)
+        if self.backend not in ("numpy", "numpy_compiled", "numpy_int8"):
+            raise ValueError(f"Unknown inference backend: {self.backend}")
+
+        from hate.ml.numpy_lstm import NumpyLSTMModel, LSTMWeights
+        from hate.ml.quantization import load_quantized, from_quantized_arrays
+        from hate.ml.weight_store import has_weight_store, load_weight_store
+
+        # 🗺️ Prefer the memory-mapped weight store: workers share one copy through the page cache
+        weight_store_dir = os.path.join(pushed_model_dir, WEIGHT_STORE_DIR_NAME)
+        if has_weight_store(weight_store_dir):
+            arrays, metadata = load_weight_store(weight_store_dir)
+            if self.backend == "numpy_int8":
+                return NumpyLSTMModel(from_quantized_arrays(arrays, metadata))
+            return NumpyLSTMModel(LSTMWeights.from_arrays(
+                arrays, metadata, compiled=self.backend == "numpy_compiled"
+            ))
+
+        if self.backend == "numpy_compiled":
+            compiled_model_path = os.path.join(pushed_model_dir, COMPILED_MODEL_NAME)
+            if os.path.exists(compiled_model_path):
+                return NumpyLSTMModel.from_compiled(compiled_model_path)
+            logging.warning(f"⚠️ {compiled_model_path} not found, compiling from {model_path}")
+            return NumpyLSTMModel(LSTMWeights.from_h5(model_path).compiled())
+        if self.backend == "numpy_int8":
+            return NumpyLSTMModel(load_quantized(os.path.join(pushed_model_dir, QUANTIZED_MODEL_NAME)))
+        return NumpyLSTMModel.from_h5(model_path)
+
+    def load_stem_table(self, pushed_model_dir: str) -> None:
+        stem_table_path = os.path.join(pushed_model_dir, STEM_TABLE_FILE_NAME)
+        if not os.path.exists(stem_table_path):
+            logging.warning(f"⚠️ {STEM_TABLE_FILE_NAME} not found, stems will be computed on demand")
+            return
+        stems = self.normalizer.load_stem_table(stem_table_path)
+        logging.info(f"✅ Cached {stems} new stems from {stem_table_path}")
+
+    def load_max_len(self, pushed_model_dir: str) -> int:
+        # 📏 Pad to the input length of the loaded model itself; the pushed metadata only cross-checks it
+        max_len = int(self.model.input_shape[1] if self.backend == "keras" else self.model.maxlen)
+        metadata_path = os.path.join(pushed_model_dir, MODEL_METADATA_FILE_NAME)
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as handle:
+                metadata_max_len = json.load(handle).get("max_len")
+            if metadata_max_len is not None and int(metadata_max_len) != max_len:
+                logging.warning(
+                    f"⚠️ {metadata_path} says max_len {metadata_max_len}, model input length is {max_len}; "
+                    f"padding to {max_len}"
+                )
+        logging.info(f"✅ Sequence length {max_len}")
+        return max_len
+
     def clean_text(self, text: str) -> str:
-        text = text.lower()
-        text = re.sub(r"http\S+|www\S+|https\S+", '', text, flags=re.MULTILINE)
-        text = re.sub(r"\@\w+|\#", '', text)
-        text = re.sub(r"[^A-Za-z0-9\s]+", '', text)
-        return text.strip()
+        # Same cleaning the training data went through
+        return self.normalizer.normalize(text)
+
+    @staticmethod
+    def label_for(score: float) -> str:
+        return "hate and abusive" if score > 0.5 else "no hate"
+
+    def predict_scores(self, texts, batch_size: int = 32):
+        """
+        Scores a list of texts, tokenizing them in one pass through the tokenizer.
+
+        :param texts: List of raw input texts
+        :param batch_size: Rows per forward pass of the model
+        :return: List of float scores, one per input text, in input order
+        """
+        try:
+            cleaned_texts = self.normalizer.normalize_batch(texts)
+            seqs = self.tokenizer.texts_to_sequences(cleaned_texts)
+            padded = pad_sequences(seqs, maxlen=self.max_len)
+
+            if self.backend != "keras":
+                preds = self.model.predict(padded, batch_size=batch_size)
+            else:
+                preds = self.model.predict(padded, batch_size=batch_size, verbose=0)
+            return [float(p[0]) for p in preds]
+        except Exception as e:
+            raise CustomException(f"❌ Prediction failed: {e}", sys)
 
     def predict(self, text: str) -> str:
         try:
             logging.info("🔍 Running prediction...")
 
-            cleaned_text = self.clean_text(text)
-            seq = self.tokenizer.texts_to_sequences([cleaned_text])
-            padded = pad_sequences(seq, maxlen=300)
-
-            pred = self.model.predict(padded)[0][0]
+            pred = self.predict_scores([text])[0]
             logging.info(f"✅ Prediction value: {pred}")
 
-            return "hate and abusive" if pred > 0.5 else "no hate"
+            return self.label_for(pred)
         except Exception as e:
             raise CustomException(f"❌ Prediction failed: {e}", sys)
 
@@ -0,0 +1,146 @@
+# stage_cache.py - Content-fingerprinted reuse of pipeline stage outputs across runs
+
+import os
+import json
+import hashlib
+import inspect
+from zipfile import ZipFile, ZipInfo, is_zipfile
+from dataclasses import asdict
+from hate.logger import logging
+from hate.constants import STAGE_CACHE_DIR, STAGE_CACHE_ENABLED
+from hate.utils.data_io import open_data_file, data_file_exists, split_zip_member_path
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_sha256(path: str) -> str:
+    """
+    Content hash of a plain file or a "<zip>::<member>" reference.
+    """
+    digest = hashlib.sha256()
+    with open_data_file(path) as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _zip_info_key(info: ZipInfo) -> str:
+    return f"{info.filename}:{info.CRC:08x}:{info.file_size}:{info.compress_size}"
+
+
+def input_fingerprint(path: str) -> str:
+    """
+    Fingerprint of a stage input. Zip archives and "<zip>::<member>" references are keyed by
+    the CRC-32 and sizes in the archive's central directory, so nothing is decompressed or read
+    in full; plain files are content hashed.
+    """
+    zip_path, member = split_zip_member_path(path)
+    if member is not None:
+        with ZipFile(zip_path) as archive:
+            key = _zip_info_key(archive.getinfo(member))
+    elif is_zipfile(path):
+        with ZipFile(path) as archive:
+            key = "\n".join(_zip_info_key(info) for info in archive.infolist())
+    else:
+        return file_sha256(path)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def source_sha256(source) -> str:
+    """
+    Hash of the code a stage depends on: a module, class or function, or the path of a data file
+    shipped with the code (e.g. the stopword list).
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as handle:
+            return hashlib.sha256(handle.read()).hexdigest()
+    return hashlib.sha256(inspect.getsource(source).encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    """
+    Maps a stage fingerprint to the outputs a previous run produced for it.
+
+    A fingerprint covers the content of the stage's inputs (zip contents by their CRC-32), the
+    config values that affect its output and the source of the code that computes it. Outputs stay in the run folder that
+    produced them; the cache only keeps a small JSON index entry per (stage, fingerprint) and
+    treats an entry whose files have since been deleted as a miss.
+    """
+    def __init__(self, cache_dir: str = STAGE_CACHE_DIR, enabled: bool = STAGE_CACHE_ENABLED):
+        self.cache_dir = os.path.join(os.getcwd(), cache_dir)
+        self.enabled = enabled
+
+    def fingerprint(self, stage: str, input_paths: list, config: dict, sources: list) -> str:
+        digest = hashlib.sha256(stage.encode("utf-8"))
+        for path in input_paths:
+            digest.update(input_fingerprint(path).encode("utf-8"))
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        for source in sources:
+            digest.update(source_sha256(source).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, stage: str, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{fingerprint}.json")
+
+    def lookup(self, stage: str, fingerprint: str):
+        """
+        :return: Dict of outputs stored for this fingerprint, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        entry_path = self._entry_path(stage, fingerprint)
+        if not os.path.exists(entry_path):
+            return None
+        with open(entry_path) as handle:
+            outputs = json.load(handle)
+
+        missing = self._missing_files(outputs)
+        if missing:
+            logging.warning(f"⚠️ Stage cache entry for {stage} refers to missing files {missing}, recomputing")
+            return None
+        logging.info(f"♻️ Stage cache hit for {stage} ({fingerprint[:12]})")
+        return outputs
+
+    @staticmethod
+    def _missing_files(outputs: dict) -> list:
+        return [
+            value for value in outputs.values()
+            if isinstance(value, str) and os.path.isabs(value) and not data_file_exists(value)
+        ]
+
+    def latest(self, stage: str):
+        """
+        Outputs of the most recently stored entry for a stage whatever its fingerprint, for
+        seeding a recomputation with reusable state (e.g. the stem table).
+
+        :return: Dict of outputs, or None if the stage has no entry whose files still exist
+        """
+        stage_dir = os.path.join(self.cache_dir, stage)
+        if not self.enabled or not os.path.isdir(stage_dir):
+            return None
+        entry_paths = [
+            os.path.join(stage_dir, name) for name in os.listdir(stage_dir) if name.endswith(".json")
+        ]
+        for entry_path in sorted(entry_paths, key=os.path.getmtime, reverse=True):
+            with open(entry_path) as handle:
+                outputs = json.load(handle)
+            if not self._missing_files(outputs):
+                return outputs
+        return None
+
+    def store(self, stage: str, fingerprint: str, outputs) -> None:
+        """
+        :param outputs: Artifact dataclass or dict of JSON-serializable outputs
+        """
+        if not self.enabled:
+            return
+        if not isinstance(outputs, dict):
+            outputs = asdict(outputs)
+        outputs = {key: value for key, value in outputs.items() if key != "cache_hit"}
+
+        entry_path = self._entry_path(stage, fingerprint)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = entry_path + ".tmp"
+        with open(tmp_path, 'w') as handle:
+            json.dump(outputs, handle, indent=2)
+        os.replace(tmp_path, entry_path)
@@ -0,0 +1,121 @@
+import json
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from hate.logger import logging
+from hate.pipeline.prediction_pipeline import PredictionPipeline
+
+
+async def iter_ndjson_lines(byte_stream):
+    """
+    Splits an async stream of byte chunks into NDJSON lines.
+
+    Only the trailing partial line is kept in memory between chunks.
+    """
+    buffer = b""
+    async for chunk in byte_stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def parse_ndjson_row(line: bytes, row: int):
+    """
+    Reads one input row. A row is either a JSON string or an object with "text" and optional "id".
+
+    :return: Tuple of (row id, text)
+    """
+    record = json.loads(line)
+    if isinstance(record, str):
+        return row, record
+    if isinstance(record, dict) and isinstance(record.get("text"), str):
+        return record.get("id", row), record["text"]
+    raise ValueError("row must be a JSON string or an object with a 'text' field")
+
+
+class StreamScorer:
+    """
+    Scores an NDJSON upload chunk by chunk and yields NDJSON results as each chunk finishes.
+
+    At most chunk_size rows are held in memory at a time, whatever the upload size.
+    Every output line, scores and invalid-row errors alike, carries the input "row" number
+    and lines arrive in input order; after a dropped connection the
+    client re-sends the same body with offset set to the last row it received plus one,
+    and rows before the offset are skipped without being scored.
+    """
+    def __init__(self, prediction_pipeline: PredictionPipeline, chunk_size: int, inference_batch_size: int,
+                 inference_executor):
+        self.prediction_pipeline = prediction_pipeline
+        self.chunk_size = chunk_size
+        self.inference_batch_size = inference_batch_size
+        self.inference_executor = inference_executor
+
+    async def _score_chunk(self, rows):
+        """
+        :param rows: Tuples of (row, row id, text, error) in input order; rows with an error are not scored
+        :return: NDJSON lines for every row, in input order
+        """
+        texts = [text for _, _, text, error in rows if error is None]
+        scores = iter(await self.inference_executor.run(
+            self.prediction_pipeline.predict_scores, texts, self.inference_batch_size
+        ) if texts else [])
+        out = []
+        for row, row_id, _, error in rows:
+            if error is not None:
+                record = {"row": row, "error": error}
+            else:
+                score = next(scores)
+                record = {"row": row, "id": row_id, "score": score,
+                          "prediction": PredictionPipeline.label_for(score)}
+            out.append(json.dumps(record))
+        return ("\n".join(out) + "\n").encode("utf-8")
+
+    async def stream(self, byte_stream, offset: int = 0):
+        row = -1
+        scored = 0
+        rows = []
+
+        async for line in iter_ndjson_lines(byte_stream):
+            row += 1
+            if row < offset:
+                continue
+            try:
+                row_id, text = parse_ndjson_row(line, row)
+                rows.append((row, row_id, text, None))
+            except Exception as e:
+                # Buffered with the valid rows so output rows stay in input order
+                rows.append((row, None, None, f"invalid row: {e}"))
+
+            if len(rows) >= self.chunk_size:
+                yield await self._score_chunk(rows)
+                scored += sum(error is None for *_, error in rows)
+                rows = []
+
+        if rows:
+            yield await self._score_chunk(rows)
+            scored += sum(error is None for *_, error in rows)
+
+        logging.info(f"✅ Streamed scores for {scored} rows (offset={offset})")
+        summary = {"done": True, "rows_scored": scored, "next_offset": max(row + 1, offset)}
+        yield (json.dumps(summary) + "\n").encode("utf-8")
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for a body iterator that reads the request body while it streams.
+
+    StreamingResponse runs a disconnect listener on receive() next to the body iterator; that
+    listener would swallow the http.request messages still carrying the upload. Here the body
+    iterator is the only reader of receive(), and a disconnect surfaces from request.stream().
+    """
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except ClientDisconnect:
+            logging.warning("⚠️ Client disconnected during streamed scoring")
+            return
+        if self.background is not None:
+            await self.background()
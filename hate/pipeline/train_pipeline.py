@@ -1,7 +1,22 @@
 import os
 import sys
+import hate.components.data_ingestion as data_ingestion_module
+import hate.components.data_transformation as data_transformation_module
+import hate.preprocessing.text_normalizer as text_normalizer_module
+import hate.preprocessing.dedup as dedup_module
+import hate.utils.data_io as data_io_module
 from hate.logger import logging
 from hate.exception import CustomException
+from hate.constants import (
+    ARTIFACTS_DIR,
+    DATA_INGESTION_STAGE,
+    DATA_TRANSFORMATION_STAGE,
+    MODEL_TRAINER_STAGE,
+    MODEL_EVALUATION_STAGE,
+    MODEL_PUSHER_STAGE,
+    STEM_CACHE_SIZE,
+    STEM_TABLE_FILE_NAME
+)
 
 from hate.entity.config_entity import (
     DataIngestionConfig,
@@ -16,6 +31,8 @@ from hate.components.data_transformation import DataTransformation
 from hate.components.model_trainer import ModelTrainer
 from hate.components.model_evaluation import ModelEvaluation
 from hate.components.model_pusher import ModelPusher
+from hate.pipeline.stage_cache import StageCache
+from hate.pipeline.prediction_pipeline import get_latest_pushed_model_dir
 
 from hate.entity.artifact_entity import (
     DataIngestionArtifacts,
@@ -27,29 +44,101 @@ from hate.entity.artifact_entity import (
 
 
 class TrainPipeline:
-    def __init__(self):
-        self.data_ingestion_config = DataIngestionConfig()
-        self.data_transformation_config = DataTransformationConfig()
-        self.model_trainer_config = ModelTrainerConfig()
-        self.model_evaluation_config = ModelEvaluationConfig()
-        self.model_pusher_config = ModelPusherConfig()
+    def __init__(self, artifacts_dir: str = ARTIFACTS_DIR, progress_callback=None):
+        """
+        :param artifacts_dir: Artifact folder of this run, relative to the working directory
+        :param progress_callback: Optional callable(stage, status) notified as each stage starts and ends
+        """
+        self.artifacts_dir = artifacts_dir
+        self.progress_callback = progress_callback
+        self.data_ingestion_config = DataIngestionConfig(artifacts_dir)
+        self.data_transformation_config = DataTransformationConfig(artifacts_dir)
+        self.model_trainer_config = ModelTrainerConfig(artifacts_dir)
+        self.model_evaluation_config = ModelEvaluationConfig(artifacts_dir)
+        self.model_pusher_config = ModelPusherConfig(artifacts_dir)
+        self.stage_cache = StageCache()
+
+    def report_progress(self, stage: str, status: str) -> None:
+        if self.progress_callback is not None:
+            self.progress_callback(stage, status)
 
     def start_data_ingestion(self) -> DataIngestionArtifacts:
         logging.info("🚀 Starting data ingestion...")
         try:
-            ingestion = DataIngestion(self.data_ingestion_config)
-            return ingestion.initiate_data_ingestion()
+            config = self.data_ingestion_config
+            fingerprint = self.stage_cache.fingerprint(
+                DATA_INGESTION_STAGE,
+                input_paths=[config.ZIP_FILE_PATH],
+                config={
+                    "mode": config.MODE,
+                    "raw_data_file": os.path.basename(config.RAW_DATA_FILE_PATH),
+                    "imbalanced_data_file": os.path.basename(config.IMBALANCED_DATA_FILE_PATH),
+                },
+                sources=[data_ingestion_module, data_io_module]
+            )
+            cached = self.stage_cache.lookup(DATA_INGESTION_STAGE, fingerprint)
+            if cached is not None:
+                return DataIngestionArtifacts(**cached, cache_hit=True)
+
+            ingestion = DataIngestion(config)
+            artifact = ingestion.initiate_data_ingestion()
+            self.stage_cache.store(DATA_INGESTION_STAGE, fingerprint, artifact)
+            return artifact
         except Exception as e:
             raise CustomException(e, sys)
 
+    def previous_stem_table_path(self):
+        """
+        Stem table of the newest cached transformation, else of the latest pushed model.
+        Stems only depend on the word, so any earlier table is valid for the next run.
+        """
+        cached = self.stage_cache.latest(DATA_TRANSFORMATION_STAGE)
+        if cached is not None and cached.get("stem_table_path"):
+            return cached["stem_table_path"]
+        try:
+            _, pushed_model_dir = get_latest_pushed_model_dir()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        stem_table_path = os.path.join(pushed_model_dir, STEM_TABLE_FILE_NAME)
+        return stem_table_path if os.path.exists(stem_table_path) else None
+
     def start_data_transformation(self, ingestion_artifact: DataIngestionArtifacts) -> DataTransformationArtifacts:
         logging.info("🔄 Starting data transformation...")
         try:
+            # Mode, workers and chunk size change how the output is produced, not what it is
+            config = self.data_transformation_config
+            fingerprint = self.stage_cache.fingerprint(
+                DATA_TRANSFORMATION_STAGE,
+                input_paths=[ingestion_artifact.raw_data_file_path, ingestion_artifact.imbalance_data_file_path],
+                config={
+                    "id": config.ID,
+                    "drop_columns": config.DROP_COLUMNS,
+                    "class": config.CLASS,
+                    "label": config.LABEL,
+                    "tweet": config.TWEET,
+                    "stem_cache_size": STEM_CACHE_SIZE,
+                    "data_format": config.DATA_FORMAT,
+                },
+                sources=[
+                    data_transformation_module,
+                    text_normalizer_module,
+                    dedup_module,
+                    data_io_module,
+                    text_normalizer_module.STOPWORDS_PATH,
+                ]
+            )
+            cached = self.stage_cache.lookup(DATA_TRANSFORMATION_STAGE, fingerprint)
+            if cached is not None:
+                return DataTransformationArtifacts(**cached, cache_hit=True)
+
             transformation = DataTransformation(
-                data_transformation_config=self.data_transformation_config,
-                data_ingestion_artifacts=ingestion_artifact
+                data_transformation_config=config,
+                data_ingestion_artifacts=ingestion_artifact,
+                seed_stem_table_path=self.previous_stem_table_path()
             )
-            return transformation.initiate_data_transformation()
+            artifact = transformation.initiate_data_transformation()
+            self.stage_cache.store(DATA_TRANSFORMATION_STAGE, fingerprint, artifact)
+            return artifact
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -58,7 +147,8 @@ class TrainPipeline:
         try:
             trainer = ModelTrainer(
                 data_transformation_artifacts=transformation_artifact,
-                model_trainer_config=self.model_trainer_config
+                model_trainer_config=self.model_trainer_config,
+                stage_cache=self.stage_cache
             )
             return trainer.initiate_model_trainer()
         except Exception as e:
@@ -92,18 +182,32 @@ class TrainPipeline:
     def run_pipeline(self):
         logging.info("🔥 Running full training pipeline...")
         try:
+            self.report_progress(DATA_INGESTION_STAGE, "running")
             ingestion_artifact = self.start_data_ingestion()
+            self.report_progress(DATA_INGESTION_STAGE, "completed")
+
+            self.report_progress(DATA_TRANSFORMATION_STAGE, "running")
             transformation_artifact = self.start_data_transformation(ingestion_artifact)
+            self.report_progress(DATA_TRANSFORMATION_STAGE, "completed")
+
+            self.report_progress(MODEL_TRAINER_STAGE, "running")
             trainer_artifact = self.start_model_trainer(transformation_artifact)
+            self.report_progress(MODEL_TRAINER_STAGE, "completed")
+
+            self.report_progress(MODEL_EVALUATION_STAGE, "running")
             evaluation_artifact = self.start_model_evaluation(trainer_artifact, transformation_artifact)
+            self.report_progress(MODEL_EVALUATION_STAGE, "completed")
 
             if not evaluation_artifact.is_model_accepted:
                 logging.warning("⚠️ Trained model is not accepted. Stopping pipeline.")
                 raise Exception("🚫 Trained model is not better than existing model.")
 
+            self.report_progress(MODEL_PUSHER_STAGE, "running")
             self.start_model_pusher(trainer_artifact)
+            self.report_progress(MODEL_PUSHER_STAGE, "completed")
             logging.info("✅ Pipeline executed successfully.")
 
         except Exception as e:
             logging.error(f"❌ Error during pipeline execution: {e}")
             raise CustomException(e, sys)
+
@@ -0,0 +1,284 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import queue
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from datetime import datetime
+from hate.logger import logging
+from hate.exception import CustomException
+from hate.constants import (
+    TRAINING_STAGES,
+    TRAINING_NICENESS,
+    TRAINING_MAX_QUEUED_JOBS,
+    TRAINING_LOCK_FILE,
+    TRAINING_JOBS_DIR
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextmanager
+def training_lock(path: str = TRAINING_LOCK_FILE):
+    """
+    Exclusive file lock held for a whole training run, so API worker processes sharing the
+    artifacts folder (uvicorn --workers N) never train at the same time. Blocks until acquired;
+    the OS releases it if the holder dies. Without fcntl only the per-process guarantee applies.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _run_training_job(artifacts_dir: str, events, niceness: int) -> None:
+    """
+    Entry point of the training worker process. Stage progress is sent back through events.
+    """
+    try:
+        # Lower priority so training never takes CPU from serving
+        os.nice(niceness)
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        from hate.pipeline.train_pipeline import TrainPipeline
+
+        with training_lock():
+            events.put(("job", None, "running", time.time()))
+            pipeline = TrainPipeline(
+                artifacts_dir=artifacts_dir,
+                progress_callback=lambda stage, status: events.put(("stage", stage, status, time.time()))
+            )
+            pipeline.run_pipeline()
+        events.put(("job", None, "succeeded", time.time()))
+    except Exception as e:
+        events.put(("job", str(e), "failed", time.time()))
+
+
+class TrainingJob:
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = "queued"
+        self.artifacts_dir = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.stages = {stage: {"status": "pending", "started_at": None, "finished_at": None}
+                       for stage in TRAINING_STAGES}
+
+    def update_stage(self, stage: str, status: str, at: float) -> None:
+        entry = self.stages.setdefault(stage, {"status": "pending", "started_at": None, "finished_at": None})
+        entry["status"] = status
+        if status == "running":
+            entry["started_at"] = at
+        else:
+            entry["finished_at"] = at
+
+    def to_dict(self) -> dict:
+        def iso(ts):
+            return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
+        def duration(start, end):
+            if start is None:
+                return None
+            return round((end if end is not None else time.time()) - start, 3)
+
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "artifacts_dir": self.artifacts_dir,
+            "created_at": iso(self.created_at),
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at),
+            "duration_s": duration(self.started_at, self.finished_at),
+            "error": self.error,
+            "stages": [
+                {
+                    "stage": stage,
+                    "status": entry["status"],
+                    "started_at": iso(entry["started_at"]),
+                    "finished_at": iso(entry["finished_at"]),
+                    "duration_s": duration(entry["started_at"], entry["finished_at"]),
+                }
+                for stage, entry in self.stages.items()
+            ],
+        }
+
+
+class TrainingJobManager:
+    """
+    Queues training runs and executes them one at a time in an isolated worker process.
+
+    Each job writes to its own timestamped artifact folder. The single manager thread
+    guarantees at most one job per API process, and the job process holds training_lock()
+    so jobs from other API worker processes wait ("waiting") until it finishes. Job records
+    are written to jobs_dir on every change, so any worker can report any job.
+    """
+    def __init__(self, on_success=None, max_queued_jobs: int = TRAINING_MAX_QUEUED_JOBS,
+                 niceness: int = TRAINING_NICENESS, jobs_dir: str = TRAINING_JOBS_DIR):
+        """
+        :param on_success: Optional callable(job) run in the manager thread after a job succeeds
+        :param max_queued_jobs: Maximum number of jobs waiting to run
+        :param niceness: Priority penalty applied to the training process
+        :param jobs_dir: Folder holding one <job_id>.json record per job, shared by all API workers
+        """
+        self.on_success = on_success
+        self.max_queued_jobs = max_queued_jobs
+        self.niceness = niceness
+        self.jobs_dir = jobs_dir
+        self._jobs = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._process = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="training-jobs", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._queue.put(None)
+        if self._process is not None and self._process.is_alive():
+            logging.warning("🛑 Terminating running training process")
+            self._process.terminate()
+
+    def submit(self) -> TrainingJob:
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+            if queued >= self.max_queued_jobs:
+                raise RuntimeError(f"Too many queued training jobs ({queued})")
+            job = TrainingJob(uuid.uuid4().hex)
+            self._jobs[job.job_id] = job
+            self._save(job)
+        self._queue.put(job)
+        logging.info(f"🗂️ Training job {job.job_id} queued")
+        return job
+
+    def _record_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _save(self, job: TrainingJob) -> None:
+        """
+        Writes the job record atomically. Call with self._lock held.
+        """
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        path = self._record_path(job.job_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as handle:
+            json.dump(job.to_dict(), handle)
+        os.replace(tmp_path, path)
+
+    def _load_record(self, job_id: str):
+        try:
+            with open(self._record_path(job_id)) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, job_id: str):
+        # Jobs from other API workers are only known through their records
+        if not re.fullmatch(r"[0-9a-f]{32}", job_id):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job.to_dict()
+        return self._load_record(job_id)
+
+    def list(self) -> list:
+        records = {}
+        if os.path.isdir(self.jobs_dir):
+            for file_name in os.listdir(self.jobs_dir):
+                if file_name.endswith(".json"):
+                    record = self._load_record(file_name[:-len(".json")])
+                    if record is not None:
+                        records[record["job_id"]] = record
+        with self._lock:
+            records.update({job.job_id: job.to_dict() for job in self._jobs.values()})
+        return sorted(records.values(), key=lambda record: record["created_at"])
+
+    def _worker(self) -> None:
+        while not self._stopping.is_set():
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                self._run_job(job)
+            except Exception as e:
+                logging.error(f"❌ Training job {job.job_id} crashed: {CustomException(e, sys)}")
+                with self._lock:
+                    job.status = "failed"
+                    job.error = str(e)
+                    job.finished_at = time.time()
+                    self._save(job)
+
+    def _run_job(self, job: TrainingJob) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        events = ctx.Queue()
+
+        with self._lock:
+            job.status = "waiting"
+            timestamp = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
+            job.artifacts_dir = os.path.join("artifacts", f"{timestamp}_{job.job_id[:8]}")
+            self._save(job)
+
+        logging.info(f"🚀 Training job {job.job_id} launched for {job.artifacts_dir}")
+        self._process = ctx.Process(
+            target=_run_training_job,
+            args=(job.artifacts_dir, events, self.niceness),
+            name=f"training-{job.job_id}"
+        )
+        self._process.start()
+
+        outcome = None
+        while outcome is None:
+            try:
+                kind, detail, status, at = events.get(timeout=0.5)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    outcome = ("failed", f"training process exited with code {self._process.exitcode}")
+                continue
+
+            with self._lock:
+                if kind == "stage":
+                    job.update_stage(detail, status, at)
+                elif status == "running":
+                    # The training lock is held from here on
+                    job.status = "running"
+                    job.started_at = at
+                else:
+                    outcome = (status, detail)
+                self._save(job)
+
+        self._process.join()
+        self._process = None
+
+        with self._lock:
+            job.status, job.error = outcome
+            job.finished_at = time.time()
+            for entry in job.stages.values():
+                if entry["status"] == "running":
+                    entry["status"] = "failed"
+                    entry["finished_at"] = job.finished_at
+            self._save(job)
+
+        logging.info(f"🏁 Training job {job.job_id} finished with status {job.status}")
+        if job.status == "succeeded" and self.on_success is not None:
+            self.on_success(job)
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+
+def factorize_texts(texts):
+    """
+    Hashes texts so each distinct value is processed once.
+
+    Missing values are kept as their own unique value rather than dropped, so results
+    broadcast back to every row.
+
+    :return: Tuple of (int64 codes, one per row; list of unique texts in first-seen order)
+    """
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+    return codes, list(uniques)
+
+
+def broadcast(unique_results, codes: np.ndarray) -> list:
+    """
+    Maps per-unique results back to row order.
+    """
+    return [unique_results[code] for code in codes]
+
+
+def duplicate_ratio(total_rows: int, unique_rows: int) -> float:
+    return 1.0 - unique_rows / total_rows if total_rows else 0.0
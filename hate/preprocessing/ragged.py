@@ -0,0 +1,85 @@
+import os
+import itertools
+import numpy as np
+
+RAGGED_TOKENS_FILE_NAME = "tokens.npy"
+RAGGED_OFFSETS_FILE_NAME = "offsets.npy"
+
+
+class RaggedTokens:
+    """
+    Tokenized corpus in CSR form: one flat token array plus row offsets, so row i is
+    tokens[offsets[i]:offsets[i + 1]]. Nothing is padded until pad() is called, for any maxlen.
+    """
+    def __init__(self, tokens: np.ndarray, offsets: np.ndarray):
+        self.tokens = tokens
+        self.offsets = offsets
+
+    @classmethod
+    def from_sequences(cls, sequences, dtype=np.int32) -> "RaggedTokens":
+        lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64, count=len(sequences))
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        tokens = np.fromiter(itertools.chain.from_iterable(sequences), dtype=dtype, count=int(offsets[-1]))
+        return cls(tokens, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def pad(self, maxlen: int, rows=None, dtype=None) -> np.ndarray:
+        """
+        Pre-padded, pre-truncated matrix for the given rows, same as pad_sequences on those rows.
+
+        :param rows: Row indices to pad, all rows if None
+        :return: Array of shape (len(rows), maxlen)
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        ends = self.offsets[rows + 1]
+        starts = np.maximum(self.offsets[rows], ends - maxlen)
+        lengths = ends - starts
+
+        padded = np.zeros((len(rows), maxlen), dtype=dtype or self.tokens.dtype)
+        total = int(lengths.sum())
+        if total:
+            row_starts = np.cumsum(lengths) - lengths
+            within = np.arange(total) - np.repeat(row_starts, lengths)
+            padded[np.repeat(np.arange(len(rows)), lengths),
+                   np.repeat(maxlen - lengths, lengths) + within] = self.tokens[np.repeat(starts, lengths) + within]
+        return padded
+
+    def save(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, RAGGED_TOKENS_FILE_NAME), self.tokens, allow_pickle=False)
+        np.save(os.path.join(directory, RAGGED_OFFSETS_FILE_NAME), self.offsets, allow_pickle=False)
+        return directory
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "RaggedTokens":
+        mmap_mode = "r" if mmap else None
+        return cls(
+            np.load(os.path.join(directory, RAGGED_TOKENS_FILE_NAME), mmap_mode=mmap_mode, allow_pickle=False),
+            np.load(os.path.join(directory, RAGGED_OFFSETS_FILE_NAME), mmap_mode=mmap_mode, allow_pickle=False),
+        )
+
+
+def load_tokens(path: str):
+    """
+    Loads a token store written by the trainer: a ragged directory as RaggedTokens, or a dense
+    padded .npy matrix as a read-only memory map.
+    """
+    if os.path.isdir(path):
+        return RaggedTokens.load(path)
+    return np.load(path, mmap_mode="r")
+
+
+def save_tokens(tokens, path: str) -> str:
+    """
+    Writes RaggedTokens as a directory, or a dense padded matrix as a .npy file.
+    """
+    if isinstance(tokens, RaggedTokens):
+        return tokens.save(path)
+    np.save(path, tokens, allow_pickle=False)
+    return path
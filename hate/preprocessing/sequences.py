@@ -0,0 +1,53 @@
+import math
+import numpy as np
+
+
+def token_dtype(num_words: int):
+    """
+    Smallest dtype that holds every token index below num_words (uint16 for vocabularies up to 65536).
+    """
+    return np.uint16 if num_words <= np.iinfo(np.uint16).max + 1 else np.int32
+
+
+def pad_sequences(sequences, maxlen: int, dtype="int32", value: int = 0) -> np.ndarray:
+    """
+    NumPy equivalent of keras.utils.pad_sequences with its default pre-padding and pre-truncation.
+
+    :param sequences: List of token index lists
+    :param maxlen: Output sequence length
+    :param dtype: Output dtype
+    :param value: Padding value
+    :return: Array of shape (len(sequences), maxlen)
+    """
+    padded = np.full((len(sequences), maxlen), value, dtype=dtype)
+    for row, seq in enumerate(sequences):
+        if not len(seq):
+            continue
+        trunc = seq[-maxlen:]
+        padded[row, -len(trunc):] = trunc
+    return padded
+
+
+def percentile_length(lengths, percentile: float, max_len: int) -> int:
+    """
+    Sequence length covering the given percentile of token lengths, kept within [1, max_len].
+
+    :param lengths: Token count of every training text
+    :param percentile: Percentile in (0, 100]; 100 fits the longest text
+    :param max_len: Upper bound on the returned length
+    """
+    lengths = np.asarray(lengths)
+    if not len(lengths):
+        return max_len
+    return int(min(max(math.ceil(np.percentile(lengths, percentile)), 1), max_len))
+
+
+def fit_width(padded: np.ndarray, maxlen: int) -> np.ndarray:
+    """
+    Re-pads a pre-padded, pre-truncated matrix to another sequence length: narrowing drops leading
+    columns (exactly what pad_sequences would give), widening prepends padding columns.
+    """
+    width = padded.shape[1]
+    if width >= maxlen:
+        return padded[:, width - maxlen:]
+    return np.pad(padded, ((0, 0), (maxlen - width, 0)))
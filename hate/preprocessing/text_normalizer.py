@@ -0,0 +1,199 @@
+import os
+import re
+import json
+import string
+import threading
+import multiprocessing
+from itertools import islice
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from nltk.stem.snowball import SnowballStemmer
+from hate.constants import STEM_CACHE_SIZE
+
+# NLTK's English stopword list, bundled so no corpus download is needed
+STOPWORDS_PATH = os.path.join(os.path.dirname(__file__), "data", "stopwords_english.txt")
+
+
+def load_stopwords(path: str = STOPWORDS_PATH) -> set:
+    with open(path, encoding='utf-8') as handle:
+        return {line.strip() for line in handle if line.strip()}
+
+
+class TextNormalizer:
+    """
+    Tweet cleaning shared by training (DataTransformation) and serving (PredictionPipeline).
+
+    Steps: lowercase, drop [bracketed] text, then URLs, then <tags> (in that order, as one
+    pattern can remove the start of another, e.g. a URL inside a tag), delete
+    punctuation and newlines with str.translate, drop words containing digits, remove
+    stopwords and Snowball-stem what is left. The stemmer and stopword set are built once.
+
+    Stems are memoized in a word -> stem dict of at most max_cache_size computed entries,
+    which can be seeded from (and saved as) a persisted stem table.
+    """
+    NOISE_PATTERNS = (
+        re.compile(r'\[.*?\]'),
+        re.compile(r'https?://\S+|www\.\S+'),
+        re.compile(r'<.*?>+'),
+    )
+    DIGIT_WORD_PATTERN = re.compile(r'\w*\d\w*')
+    PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation + '\n')
+
+    def __init__(self, stopword_set=None, stemmer=None, stem_table: dict = None,
+                 max_cache_size: int = STEM_CACHE_SIZE):
+        self.stopword_set = stopword_set if stopword_set is not None else load_stopwords()
+        self.stemmer = stemmer if stemmer is not None else SnowballStemmer("english")
+        self.max_cache_size = max_cache_size
+        self.stem_cache = {}
+        if stem_table:
+            self.add_stems(stem_table)
+
+    def stem(self, word: str) -> str:
+        stemmed = self.stem_cache.get(word)
+        if stemmed is None:
+            stemmed = self.stemmer.stem(word)
+            if len(self.stem_cache) < self.max_cache_size:
+                self.stem_cache[word] = stemmed
+        return stemmed
+
+    def add_stems(self, stems: dict) -> int:
+        """
+        Memoizes word -> stem pairs that are not cached yet, keeping the cache within
+        max_cache_size entries like stem() does.
+
+        :return: Number of entries added
+        """
+        cache = self.stem_cache
+        room = self.max_cache_size - len(cache)
+        added = 0
+        for word, stemmed in stems.items():
+            if added >= room:
+                break
+            if word not in cache:
+                cache[word] = stemmed
+                added += 1
+        return added
+
+    def normalize(self, text) -> str:
+        text = str(text).lower()
+        for pattern in self.NOISE_PATTERNS:
+            text = pattern.sub('', text)
+        text = text.translate(self.PUNCTUATION_TABLE)
+        text = self.DIGIT_WORD_PATTERN.sub('', text)
+
+        stopword_set = self.stopword_set
+        cache = self.stem_cache
+        stem = self.stem
+        return " ".join(
+            cache[word] if word in cache else stem(word)
+            for word in text.split() if word not in stopword_set
+        )
+
+    def normalize_batch(self, texts) -> list:
+        normalize = self.normalize
+        return [normalize(text) for text in texts]
+
+    def __call__(self, text_or_texts):
+        if isinstance(text_or_texts, str):
+            return self.normalize(text_or_texts)
+        return self.normalize_batch(text_or_texts)
+
+    def save_stem_table(self, path: str) -> int:
+        """
+        Writes the memoized word -> stem pairs as JSON.
+
+        :return: Number of entries written
+        """
+        table = dict(sorted(self.stem_cache.items()))
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(table, handle, ensure_ascii=False)
+        return len(table)
+
+    def load_stem_table(self, path: str) -> int:
+        """
+        Merges a persisted stem table into the cache, within max_cache_size.
+
+        :return: Number of entries added
+        """
+        with open(path, encoding='utf-8') as handle:
+            table = json.load(handle)
+        return self.add_stems(table)
+
+
+_normalizer = None
+_normalizer_lock = threading.Lock()
+
+
+def get_normalizer() -> TextNormalizer:
+    """
+    Process-wide TextNormalizer, built on first use.
+    """
+    global _normalizer
+    if _normalizer is None:
+        with _normalizer_lock:
+            if _normalizer is None:
+                _normalizer = TextNormalizer()
+    return _normalizer
+
+
+# Stem cache entries a pool worker has already sent back to the parent
+_reported_stems = 0
+
+
+def _init_worker(stem_table: dict) -> None:
+    get_normalizer().add_stems(stem_table)
+    global _reported_stems
+    _reported_stems = len(get_normalizer().stem_cache)
+
+
+def _normalize_chunk(texts: list):
+    """
+    Cleans one chunk in a pool worker.
+
+    :return: Tuple of (cleaned texts, stems memoized since the previous chunk)
+    """
+    global _reported_stems
+    normalizer = get_normalizer()
+    cleaned = normalizer.normalize_batch(texts)
+    # Dicts keep insertion order, so new stems are the entries past the last report
+    new_stems = dict(islice(normalizer.stem_cache.items(), _reported_stems, None))
+    _reported_stems = len(normalizer.stem_cache)
+    return cleaned, new_stems
+
+
+def normalizer_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers each hold a normalizer seeded with this process's stem cache.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(get_normalizer().stem_cache,)
+    )
+
+
+def normalize_parallel(texts, workers: int, chunk_size: int, pool: ProcessPoolExecutor = None) -> list:
+    """
+    Cleans texts in chunks across a process pool, preserving input order.
+
+    Each worker builds its own normalizer once, and the stems the workers compute are merged
+    back so the saved stem table matches the serial run.
+
+    :param workers: Pool size; 1 or fewer cleans serially in this process
+    :param chunk_size: Texts sent to a worker per task
+    :param pool: Optional pool from normalizer_pool, reused across calls instead of starting one here
+    :return: Cleaned texts, identical to get_normalizer().normalize_batch(texts)
+    """
+    normalizer = get_normalizer()
+    texts = list(texts)
+    if workers <= 1 or len(texts) <= chunk_size:
+        return normalizer.normalize_batch(texts)
+
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    cleaned = []
+    with nullcontext(pool) if pool is not None else normalizer_pool(min(workers, len(chunks))) as executor:
+        for chunk_cleaned, new_stems in executor.map(_normalize_chunk, chunks):
+            cleaned.extend(chunk_cleaned)
+            normalizer.add_stems(new_stems)
+    return cleaned
@@ -0,0 +1,98 @@
+import json
+import numpy as np
+
+VOCABULARY_FORMAT_VERSION = 1
+
+
+class CompactTokenizer:
+    """
+    Pickle-free replacement for the fitted Keras Tokenizer at serving time.
+
+    Only the word -> index map below num_words is kept. On disk it is a sorted UTF-8 string
+    table (blob + offsets) with a parallel int32 index array, in a versioned .npz file.
+    texts_to_sequences matches keras.preprocessing.text.Tokenizer for word-level tokenizers.
+    """
+    def __init__(self, word_index: dict, num_words=None, filters: str = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n',
+                 lower: bool = True, split: str = " ", oov_index=None):
+        self.word_index = word_index
+        self.num_words = num_words
+        self.filters = filters
+        self.lower = lower
+        self.split = split
+        self.oov_index = oov_index
+        self._translate_map = str.maketrans({c: split for c in filters})
+
+    @classmethod
+    def from_keras_tokenizer(cls, tokenizer) -> "CompactTokenizer":
+        if tokenizer.char_level or tokenizer.analyzer is not None:
+            raise ValueError("Only word-level tokenizers without a custom analyzer can be exported")
+        num_words = tokenizer.num_words
+        word_index = {
+            word: index for word, index in tokenizer.word_index.items()
+            if not num_words or index < num_words
+        }
+        oov_index = tokenizer.word_index.get(tokenizer.oov_token) if tokenizer.oov_token is not None else None
+        return cls(word_index, num_words, tokenizer.filters, tokenizer.lower, tokenizer.split, oov_index)
+
+    def save(self, path: str) -> None:
+        words = sorted(self.word_index)
+        encoded = [word.encode("utf-8") for word in words]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(word) for word in encoded])
+        metadata = {
+            "format_version": VOCABULARY_FORMAT_VERSION,
+            "num_words": self.num_words,
+            "filters": self.filters,
+            "lower": self.lower,
+            "split": self.split,
+            "oov_index": self.oov_index,
+        }
+        np.savez(
+            path,
+            metadata=np.array(json.dumps(metadata)),
+            string_blob=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            string_offsets=offsets,
+            indices=np.array([self.word_index[word] for word in words], dtype=np.int32),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CompactTokenizer":
+        with np.load(path, allow_pickle=False) as bundle:
+            metadata = json.loads(str(bundle["metadata"]))
+            if metadata["format_version"] != VOCABULARY_FORMAT_VERSION:
+                raise ValueError(f"Unsupported vocabulary version: {metadata['format_version']}")
+            blob = bundle["string_blob"].tobytes()
+            offsets = bundle["string_offsets"].tolist()
+            indices = bundle["indices"].tolist()
+
+        word_index = {
+            blob[offsets[k]:offsets[k + 1]].decode("utf-8"): index
+            for k, index in enumerate(indices)
+        }
+        return cls(word_index, metadata["num_words"], metadata["filters"], metadata["lower"],
+                   metadata["split"], metadata["oov_index"])
+
+    def text_to_word_sequence(self, text: str) -> list:
+        if self.lower:
+            text = text.lower()
+        return [word for word in text.translate(self._translate_map).split(self.split) if word]
+
+    def texts_to_sequences(self, texts) -> list:
+        lookup = self.word_index.get
+        translate_map = self._translate_map
+        split = self.split
+        lower = self.lower
+        oov_index = self.oov_index
+
+        sequences = []
+        for text in texts:
+            if lower:
+                text = text.lower()
+            words = text.translate(translate_map).split(split)
+            if oov_index is None:
+                sequences.append([index for index in map(lookup, words) if index is not None])
+            else:
+                # Empty strings from repeated separators are not words and must not become OOV
+                indices = map(lookup, [word for word in words if word])
+                sequences.append([oov_index if index is None else index for index in indices])
+        return sequences
@@ -0,0 +1,176 @@
+# data_io.py - Read pipeline data from plain files or straight out of a zip archive
+
+import os
+from zipfile import ZipFile
+from contextlib import contextmanager
+import pandas as pd
+
+# Separates the archive path from the member name in a zip member reference
+ZIP_MEMBER_SEPARATOR = "::"
+
+
+def zip_member_path(zip_path: str, member: str) -> str:
+    """
+    Reference to a file inside a zip archive, usable anywhere a data file path is expected.
+    """
+    return f"{zip_path}{ZIP_MEMBER_SEPARATOR}{member}"
+
+
+def split_zip_member_path(path: str):
+    """
+    :return: Tuple of (archive path, member name), or (path, None) for a plain file
+    """
+    if ZIP_MEMBER_SEPARATOR in path:
+        zip_path, member = path.split(ZIP_MEMBER_SEPARATOR, 1)
+        return zip_path, member
+    return path, None
+
+
+def data_file_exists(path: str) -> bool:
+    zip_path, member = split_zip_member_path(path)
+    if member is None:
+        return os.path.exists(path)
+    if not os.path.exists(zip_path):
+        return False
+    with ZipFile(zip_path) as archive:
+        return member in archive.namelist()
+
+
+@contextmanager
+def open_data_file(path: str):
+    """
+    Opens a plain file or a zip member for binary reading. Zip members are decompressed
+    as they are read, without extracting them to disk.
+    """
+    zip_path, member = split_zip_member_path(path)
+    if member is None:
+        with open(path, 'rb') as handle:
+            yield handle
+    else:
+        with ZipFile(zip_path) as archive, archive.open(member) as handle:
+            yield handle
+
+
+def read_csv(path: str, **kwargs) -> pd.DataFrame:
+    with open_data_file(path) as handle:
+        return pd.read_csv(handle, **kwargs)
+
+
+def iter_csv_chunks(path: str, chunksize: int, **kwargs):
+    """
+    Yields DataFrames of at most chunksize rows, keeping the file or zip member open until done.
+    """
+    with open_data_file(path) as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunksize, **kwargs):
+            yield chunk
+
+
+# Intermediate dataset formats; columnar ones keep dtypes and need pyarrow
+DATA_FORMAT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+
+def data_file_name(file_name: str, data_format: str) -> str:
+    """
+    Swaps the extension of an intermediate dataset file name for the configured format.
+    """
+    if data_format not in DATA_FORMAT_EXTENSIONS:
+        raise ValueError(f"Unknown data format: {data_format}")
+    return os.path.splitext(file_name)[0] + DATA_FORMAT_EXTENSIONS[data_format]
+
+
+def _data_format(path: str) -> str:
+    extension = os.path.splitext(split_zip_member_path(path)[1] or path)[1]
+    for data_format, format_extension in DATA_FORMAT_EXTENSIONS.items():
+        if extension == format_extension:
+            return data_format
+    return "csv"
+
+
+def _with_dtypes(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    if not dtypes:
+        return df
+    df = df.copy()
+    for column, dtype in dtypes.items():
+        if column not in df.columns:
+            continue
+        if dtype is str:
+            df[column] = df[column].fillna("").astype(str)
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def read_table(path: str, columns=None, dtypes: dict = None) -> pd.DataFrame:
+    """
+    Reads an intermediate dataset, picking the format from the file extension.
+
+    :param dtypes: Column dtypes the file was written with. Columnar files already store them;
+                   CSV is parsed straight into them, with empty strings kept instead of NaN
+    """
+    data_format = _data_format(path)
+    if data_format == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if data_format == "feather":
+        return pd.read_feather(path, columns=columns)
+    if dtypes:
+        return read_csv(path, usecols=columns, dtype=dtypes, keep_default_na=False)
+    return read_csv(path, usecols=columns)
+
+
+def write_table(df, path: str, dtypes: dict = None) -> None:
+    """
+    Writes a DataFrame (or Series) in the format given by the file extension, casting
+    columns to dtypes first so columnar files load back without re-parsing.
+    """
+    with TableWriter(path, dtypes) as writer:
+        writer.write(df)
+
+
+class TableWriter:
+    """
+    Appends DataFrame chunks to one CSV, Parquet (one row group per chunk) or Feather file.
+    """
+    def __init__(self, path: str, dtypes: dict = None):
+        self.path = path
+        self.dtypes = dtypes
+        self.data_format = _data_format(path)
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df) -> None:
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+        df = _with_dtypes(df, self.dtypes)
+
+        if self.data_format == "csv":
+            df.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        else:
+            import pyarrow as pa
+            if self._schema is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._schema = table.schema
+                self._writer = self._open_writer(table.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        self.rows += len(df)
+
+    def _open_writer(self, schema):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self.data_format == "parquet":
+            return pq.ParquetWriter(self.path, schema)
+        # Feather v2 is the Arrow IPC file format
+        return pa.ipc.new_file(self.path, schema)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -8,5 +8,7 @@ setup(
     author="Muskan Ara",
     author_email="muskan17ara@gmail.com",
     packages=find_packages(),
+    package_data={"hate.preprocessing": ["data/*.txt"]},
+    include_package_data=True,
     install_required = [],
 )
\ No newline at end of file
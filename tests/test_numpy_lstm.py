@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+keras = pytest.importorskip("keras")
+
+from hate.ml.model import ModelArchitecture
+from hate.ml.numpy_lstm import LSTMWeights, NumpyLSTMModel, compare_with_keras
+
+VOCAB_SIZE = 50
+MAXLEN = 12
+TOLERANCE = 1e-5
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    keras.utils.set_random_seed(0)
+    model = ModelArchitecture().get_model(input_dim=VOCAB_SIZE, input_length=MAXLEN)
+    # Default initialization keeps every score near 0.5; larger weights spread them out so
+    # a wrong state or gate order shows up far above the tolerance
+    rng = np.random.default_rng(0)
+    model.set_weights([rng.normal(0, 0.5, w.shape).astype(np.float32) for w in model.get_weights()])
+    path = str(tmp_path_factory.mktemp("model") / "model.h5")
+    model.save(path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def padded():
+    rng = np.random.default_rng(0)
+    rows = [np.zeros(MAXLEN, dtype=np.int32), np.zeros(MAXLEN, dtype=np.int32)]  # all padding
+    for length in (1, 3, 7, MAXLEN, MAXLEN):
+        row = np.zeros(MAXLEN, dtype=np.int32)
+        row[MAXLEN - length:] = rng.integers(1, VOCAB_SIZE, size=length)
+        rows.append(row)
+    rows.extend(rng.integers(0, VOCAB_SIZE, size=(20, MAXLEN)).astype(np.int32))
+    return np.stack(rows)
+
+
+@pytest.fixture(scope="module")
+def keras_scores(model_path, padded):
+    return keras.models.load_model(model_path).predict(padded, verbose=0)
+
+
+def test_numpy_matches_keras(model_path, padded, keras_scores):
+    scores = NumpyLSTMModel.from_h5(model_path).predict(padded)
+    np.testing.assert_allclose(scores, keras_scores, atol=TOLERANCE)
+
+
+def test_numpy_compiled_matches_keras(model_path, padded, keras_scores):
+    scores = NumpyLSTMModel(LSTMWeights.from_h5(model_path).compiled()).predict(padded)
+    np.testing.assert_allclose(scores, keras_scores, atol=TOLERANCE)
+
+
+def test_numpy_compiled_bundle_matches_keras(model_path, padded, keras_scores, tmp_path):
+    compiled_path = str(tmp_path / "compiled_model.npz")
+    LSTMWeights.from_h5(model_path).save_compiled(compiled_path)
+    scores = NumpyLSTMModel.from_compiled(compiled_path).predict(padded)
+    np.testing.assert_allclose(scores, keras_scores, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 256])
+def test_zero_prefix_skip_matches_full_recurrence(model_path, padded, keras_scores, batch_size):
+    model = NumpyLSTMModel.from_h5(model_path)
+    # Stepping through every padding token, no precomputed prefix states
+    full = model._forward(padded, 0)
+    skipped = model.predict(padded, batch_size=batch_size)
+    np.testing.assert_allclose(skipped, full, atol=TOLERANCE)
+    np.testing.assert_allclose(skipped, keras_scores, atol=TOLERANCE)
+
+
+def test_all_padding_rows_use_final_prefix_state(model_path, padded, keras_scores):
+    model = NumpyLSTMModel.from_h5(model_path)
+    scores = model.predict(padded[:2])
+    np.testing.assert_allclose(scores, keras_scores[:2], atol=TOLERANCE)
+    np.testing.assert_allclose(scores[0], scores[1])
+
+
+def test_compare_with_keras(model_path, padded):
+    assert compare_with_keras(model_path, padded) < TOLERANCE
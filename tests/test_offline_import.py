@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_app_does_no_network_io():
+    # Fresh interpreter: modules already imported by other tests would hide import-time downloads
+    script = textwrap.dedent("""
+        import socket
+
+        def blocked(*args, **kwargs):
+            raise AssertionError(f"network access during import: {args}")
+
+        socket.socket.connect = blocked
+        socket.socket.connect_ex = blocked
+        socket.getaddrinfo = blocked
+        socket.create_connection = blocked
+
+        import app
+        from hate.preprocessing.text_normalizer import get_normalizer
+        assert get_normalizer().normalize("Running wild!") == "run wild"
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=300
+    )
+    assert result.returncode == 0, result.stderr
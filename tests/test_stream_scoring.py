@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import app as app_module
+from hate.pipeline.model_holder import model_holder
+
+
+class FakePipeline:
+    artifact_version = "test"
+
+    def predict_scores(self, texts, batch_size=32):
+        return [min(len(text) / 100.0, 1.0) for text in texts]
+
+
+@pytest.fixture
+def loaded_model(monkeypatch):
+    monkeypatch.setattr(model_holder, "_pipeline", FakePipeline())
+    monkeypatch.setattr(app_module.serving_config, "STREAM_CHUNK_SIZE", 3)
+
+
+def post_stream(chunks, query: bytes = b""):
+    """
+    Drives the ASGI app directly so the body arrives as several http.request messages,
+    as it does from a real server for a chunked upload.
+    """
+    async def run():
+        messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+        messages.append({"type": "http.request", "body": b"", "more_body": False})
+        response_done = asyncio.Event()
+        sent = []
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_done.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": "/predict/stream", "raw_path": b"/predict/stream",
+            "query_string": query, "root_path": "", "client": ("testclient", 50000),
+            "server": ("testserver", 80), "headers": [(b"content-type", b"application/x-ndjson")],
+        }
+        await asyncio.wait_for(app_module.app(scope, receive, send), timeout=30)
+        return sent
+
+    sent = asyncio.run(run())
+    assert sent[0]["status"] == 200
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+def ndjson_chunks(rows, chunk_bytes: int = 7):
+    # Small fixed-size chunks split lines across http.request messages
+    payload = "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+    return [payload[i:i + chunk_bytes] for i in range(0, len(payload), chunk_bytes)]
+
+
+def test_multi_chunk_upload_scores_every_row(loaded_model):
+    rows = [{"id": f"r{i}", "text": "x" * i} for i in range(10)]
+    lines = post_stream(ndjson_chunks(rows))
+
+    *results, summary = lines
+    assert [r["row"] for r in results] == list(range(10))
+    assert [r["id"] for r in results] == [f"r{i}" for i in range(10)]
+    assert [r["score"] for r in results] == [i / 100.0 for i in range(10)]
+    assert summary == {"done": True, "rows_scored": 10, "next_offset": 10}
+
+
+def test_invalid_rows_stay_in_order(loaded_model):
+    chunks = ndjson_chunks(["a", "bb"]) + [b'{"oops": 1}\n'] + ndjson_chunks(["ccc"])
+    *results, summary = post_stream(chunks)
+
+    assert [r["row"] for r in results] == [0, 1, 2, 3]
+    assert "error" in results[2]
+    assert summary == {"done": True, "rows_scored": 3, "next_offset": 4}
+
+
+def test_resume_from_offset(loaded_model):
+    rows = [f"text {i}" for i in range(8)]
+    *results, summary = post_stream(ndjson_chunks(rows), query=b"offset=5")
+
+    assert [r["row"] for r in results] == [5, 6, 7]
+    assert [r["id"] for r in results] == [5, 6, 7]
+    assert summary == {"done": True, "rows_scored": 3, "next_offset": 8}
@@ -0,0 +1,57 @@
+import re
+import string
+
+import pytest
+
+from hate.preprocessing.text_normalizer import TextNormalizer
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return TextNormalizer()
+
+
+def legacy_clean(text, normalizer):
+    # The original DataTransformation.concat_data_cleaning substitution sequence
+    text = str(text).lower()
+    text = re.sub(r'\[.*?\]', '', text)
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'<.*?>+', '', text)
+    text = re.sub(r'[%s]' % re.escape(string.punctuation), '', text)
+    text = re.sub(r'\n', '', text)
+    text = re.sub(r'\w*\d\w*', '', text)
+    words = [word for word in text.split() if word not in normalizer.stopword_set]
+    return " ".join(normalizer.stemmer.stem(word) for word in words)
+
+
+@pytest.mark.parametrize("text", [
+    "<a href=http://x.com>hello</a> world",
+    "[see https://x.com/a]b] running",
+    "check www.example.com<b>bold</b> now",
+    "<img src=www.x.org/[1]> cats",
+    "http://a.com/<tag> [note] Dogs\nbarking",
+    "RT @user: 2day is the best!!! #blessed",
+    "",
+])
+def test_matches_legacy_substitution_order(normalizer, text):
+    assert normalizer.normalize(text) == legacy_clean(text, normalizer)
+
+
+def test_url_inside_tag(normalizer):
+    # The URL is removed first, which cuts the tag short and leaves "href" behind
+    assert normalizer.normalize("<a href=http://x.com>hello</a> world") == "href world"
+
+
+def test_stem_cache_stays_bounded(tmp_path):
+    normalizer = TextNormalizer(max_cache_size=3)
+    normalizer.normalize("running jumping")
+
+    assert normalizer.add_stems({"cats": "cat", "dogs": "dog", "birds": "bird"}) == 1
+    assert len(normalizer.stem_cache) == 3
+
+    table_path = tmp_path / "stem_table.json"
+    TextNormalizer(stem_table={f"w{i}": f"s{i}" for i in range(10)}).save_stem_table(str(table_path))
+    assert normalizer.load_stem_table(str(table_path)) == 0
+    assert len(normalizer.stem_cache) == 3
+    # Uncached words are still stemmed, just not memoized
+    assert normalizer.normalize("walking") == "walk"
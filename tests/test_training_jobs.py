@@ -0,0 +1,21 @@
+from hate.pipeline.training_jobs import TrainingJobManager
+
+
+def test_job_records_are_shared_between_managers(tmp_path):
+    # Two managers over one jobs folder stand in for two API worker processes
+    accepting = TrainingJobManager(jobs_dir=str(tmp_path))
+    other = TrainingJobManager(jobs_dir=str(tmp_path))
+
+    job = accepting.submit()
+
+    record = other.get(job.job_id)
+    assert record is not None
+    assert record["job_id"] == job.job_id
+    assert record["status"] == "queued"
+    assert [r["job_id"] for r in other.list()] == [job.job_id]
+
+
+def test_unknown_or_malformed_job_ids(tmp_path):
+    manager = TrainingJobManager(jobs_dir=str(tmp_path))
+    assert manager.get("0" * 32) is None
+    assert manager.get("../../etc/passwd") is None